@@ -0,0 +1,68 @@
+"""Compare `QuerySet.project` with resolving every step of every path with `getattr` and `__getitem__`.
+
+The experiments are generated in memory, so no database is needed:
+
+    python -m benchmarks.project --experiments 20000 --columns 30
+"""
+import argparse
+import timeit
+from collections import defaultdict
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from incense.experiment import Experiment
+from incense.query_set import QuerySet
+
+
+def make_experiments(n_experiments: int, n_columns: int) -> QuerySet:
+    experiments = []
+    for i in range(n_experiments):
+        run = {
+            "_id": i,
+            "experiment": {"name": "benchmark"},
+            "status": "COMPLETED",
+            "config": {"model": {f"param{j}": i * j for j in range(n_columns)}},
+        }
+        exp = Experiment.from_db_object(None, None, run, loader=None, unpickle=False)
+        exp._metrics["loss"] = pd.Series(np.random.rand(10))
+        exp._all_metrics_loaded = True
+        experiments.append(exp)
+    return QuerySet(experiments)
+
+
+def project_by_resolving(query_set: QuerySet, on) -> pd.DataFrame:
+    """The projection as done before paths were compiled."""
+    stratified_on = query_set._stratify_mapping(on)
+    rename_mapping = query_set._make_rename_mapping(stratified_on, "last")
+    projected = defaultdict(list)
+    for exp in query_set:
+        projected["exp_id"].append(exp.id)
+        for path, reducer in stratified_on.items():
+            value = reduce(lambda o, name: query_set._get(o, name, "raise"), path, exp)
+            projected[path].append(reducer(value) if callable(reducer) else value)
+    return pd.DataFrame(projected).set_index("exp_id").rename(columns=rename_mapping)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--experiments", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    query_set = make_experiments(args.experiments, args.columns)
+    on = ["experiment.name", "status", *(f"config.model.param{j}" for j in range(args.columns)), {"metrics.loss": max}]
+    assert_frame_equal(query_set.project(on=on), project_by_resolving(query_set, on))
+
+    resolve_time = min(timeit.repeat(lambda: project_by_resolving(query_set, on), number=1, repeat=args.repeat))
+    project_time = min(timeit.repeat(lambda: query_set.project(on=on), number=1, repeat=args.repeat))
+    print(f"{args.experiments} experiments x {len(on)} columns")
+    print(f"resolving: {resolve_time:.3f}s")
+    print(f"project:   {project_time:.3f}s ({resolve_time / project_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,40 @@
+import io
+import mmap
 import os
 import pickle
+import uuid
 import warnings
+from contextlib import contextmanager
 from copy import copy
+from pathlib import Path
 from typing import *
+from typing import BinaryIO
 
+import numpy as np
 import pandas as pd
 from IPython import display
 from IPython.display import HTML
 
+from .artifact_cache import ArtifactCache, link_or_copy
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Number of bytes read from an artifact file at once when it is streamed.
+DEFAULT_CHUNK_SIZE = 2**20
+
 
 class Artifact:
     """Displays or saves an artifact."""
 
     can_render: Set[str] = set()
 
-    def __init__(self, name: str, file, content_type: str = None):
+    def __init__(self, name: str, file, content_type: str = None, cache: Optional[ArtifactCache] = None):
         self.name = name
         self.file = file
         self.content_type = content_type
         self.extension = "" if self.content_type is None else self.content_type.split("/")[-1]
+        self._cache = cache
         self._content = None
         self._rendered = None
 
@@ -43,18 +59,54 @@ class Artifact:
         )
         return self.render()
 
-    def save(self, to_dir: str = "") -> None:
+    def save(self, to_dir: str = "", chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
         """
         Save artifact to disk.
 
+        The artifact is streamed to a temporary file in chunks, which is renamed once it is complete,
+        so that neither the whole artifact is held in memory nor a partially written file is left behind.
+        If the artifact is in the artifact cache, the saved file is a hardlink to the cached file,
+        so it should not be modified in place.
+
         Args:
             to_dir: Directory in which to save the artifact. Defaults to the current working directory.
+            chunk_size: The number of bytes read from the artifact file at once.
 
         """
         if to_dir:
             os.makedirs(str(to_dir), exist_ok=True)
-        with open(os.path.join(str(to_dir), self._make_filename()), "wb") as file:
-            file.write(self.content)
+        path = os.path.join(str(to_dir), self._make_filename())
+        temp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            cached_path = self._cached_path()
+            if cached_path is not None:
+                link_or_copy(cached_path, temp_path)
+            else:
+                with open(temp_path, "xb") as file:
+                    for chunk in self.iter_chunks(chunk_size):
+                        file.write(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Iterate over the raw bytes of the artifact without reading all of them into memory.
+
+        Args:
+            chunk_size: The maximum number of bytes per chunk.
+
+        Returns:
+            An iterator over consecutive chunks of the artifact.
+        """
+        if self._content is not None:
+            for start in range(0, len(self._content), chunk_size):
+                yield self._content[start : start + chunk_size]
+            return
+        with self._open() as file:
+            yield from _read_chunks(file, chunk_size)
 
     def as_content_type(self, content_type: str) -> "Artifact":
         """Interpret artifact as being of content-type."""
@@ -67,20 +119,106 @@ class Artifact:
 
     def as_type(self, artifact_type) -> "Artifact":
         self.file.seek(0)
-        return artifact_type(self.name, self.file)
+        return artifact_type(self.name, self.file, cache=self._cache)
 
     @property
     def content(self):
         """Access the raw bytes of the artifact."""
         if self._content is None:
-            self._content = self.file.read()
+            with self._open() as file:
+                self._content = file.read()
         return self._content
 
+    def as_buffer(self) -> memoryview:
+        """
+        Access the raw bytes of the artifact without copying them.
+
+        If the artifact is available on local disk, because it belongs to a file system experiment or
+        is in the artifact cache, the file is memory-mapped. Otherwise the content is downloaded.
+
+        Returns:
+            A read-only view of the bytes of the artifact.
+        """
+        local_path = self._local_path()
+        if self._content is not None or local_path is None:
+            return memoryview(self.content)
+        with open(local_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # Empty files cannot be memory-mapped.
+                return memoryview(b"")
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def as_numpy(self) -> np.ndarray:
+        """
+        Load an artifact that was saved with `numpy.save`.
+
+        If the artifact is available on local disk, the array is memory-mapped instead of read into memory.
+
+        Returns:
+            The stored array, which is read-only if it is memory-mapped.
+        """
+        local_path = self._local_path()
+        if self._content is not None or local_path is None:
+            return np.load(io.BytesIO(self.content), allow_pickle=False)
+        return np.load(local_path, mmap_mode="r", allow_pickle=False)
+
+    def _local_path(self) -> Optional[Path]:
+        """Return a path on local disk that holds the artifact, if there is one."""
+        cached_path = self._cached_path()
+        if cached_path is not None:
+            return cached_path
+        name = getattr(self.file, "name", None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return Path(name)
+        return None
+
+    @contextmanager
+    def _open(self) -> Iterator[BinaryIO]:
+        """Open the artifact for reading from the start, preferring the copy in the artifact cache."""
+        cached_path = self._cached_path()
+        if cached_path is not None:
+            try:
+                file = open(cached_path, "rb")
+            except FileNotFoundError:
+                # Evicted by another process in the meantime.
+                pass
+            else:
+                with file:
+                    yield file
+                return
+        self.file.seek(0)
+        yield self.file
+        self.file.seek(0)
+
+    def _cached_path(self) -> Optional[Path]:
+        """Return the path of the artifact in the artifact cache, downloading it first if necessary."""
+        key = self._cache_key()
+        if self._cache is None or key is None:
+            return None
+        cached_path = self._cache.get(key)
+        if cached_path is None:
+            self.file.seek(0)
+            cached_path = self._cache.put(key, _read_chunks(self.file, DEFAULT_CHUNK_SIZE))
+        return cached_path
+
+    def _cache_key(self) -> Optional[str]:
+        # Only GridFS files have an id. Files of file system experiments are local already.
+        md5 = getattr(self.file, "md5", None)
+        if md5:
+            return f"md5-{md5}"
+        file_id = getattr(self.file, "_id", None)
+        return None if file_id is None else f"file-{file_id}"
+
     def _make_filename(self):
         # TODO does this work on gridfs file?
         exp_id, artifact_name = self.file.name.split("/")[-2:]
         return f"{exp_id}_{artifact_name}" + ("" if artifact_name.endswith(self.extension) else f".{self.extension}")
 
+    def _exp_id(self) -> Union[int, str]:
+        """Infer the id of the experiment from the file name, which ends with the id and the artifact name."""
+        exp_id = self.file.name.split("/")[-2]
+        return int(exp_id) if exp_id.isdigit() else exp_id
+
 
 class ImageArtifact(Artifact):
     """Displays or saves an image artifact."""
@@ -112,8 +250,53 @@ class CSVArtifact(Artifact):
 
     can_render = {"text/csv"}
 
+    def __init__(self, name: str, file, content_type: str = None, cache: Optional[ArtifactCache] = None):
+        super().__init__(name, file, content_type, cache=cache)
+        self._frames: Dict[Hashable, pd.DataFrame] = {}
+
     def _render(self):
-        return pd.read_csv(self.file)
+        return self.to_frame()
+
+    def to_frame(
+        self,
+        usecols: Optional[Sequence[str]] = None,
+        dtype: Union[None, str, type, Dict[str, Any]] = None,
+        chunksize: Optional[int] = None,
+        engine: Optional[str] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """
+        Parse the CSV file into a dataframe.
+
+        Parsed dataframes are memoized per combination of arguments, unless they are read in chunks.
+        If the artifact is on local disk, pandas reads the file directly.
+
+        Args:
+            usecols: The columns to parse. All columns if None.
+            dtype: The type of all columns or a mapping from column names to types. Inferred if None.
+            chunksize: Return an iterator over dataframes with this many rows each instead of a single dataframe.
+            engine: {"c", "python", "pyarrow"} The parser engine of `pandas.read_csv`. "pyarrow" requires pyarrow
+                    and is the fastest one for large files, but does not support chunks.
+
+        Returns:
+            The parsed dataframe or an iterator over chunks of it.
+        """
+        kwargs = dict(usecols=usecols, dtype=dtype, engine=engine)
+        if chunksize is not None:
+            return self._iter_frames(chunksize, kwargs)
+        key = _make_key(kwargs)
+        if key not in self._frames:
+            local_path = self._local_path() if self._content is None else None
+            if local_path is not None:
+                self._frames[key] = pd.read_csv(local_path, **kwargs)
+            else:
+                with self._open() as file:
+                    self._frames[key] = pd.read_csv(file, **kwargs)
+        return self._frames[key]
+
+    def _iter_frames(self, chunksize: int, kwargs: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+        with self._open() as file:
+            with pd.read_csv(file, chunksize=chunksize, **kwargs) as reader:
+                yield from reader
 
 
 class PickleArtifact(Artifact):
@@ -121,12 +304,142 @@ class PickleArtifact(Artifact):
 
     can_render: Set[str] = set()
 
-    def __init__(self, name: str, file, content_type: str = None):
-        super().__init__(name, file, content_type)
+    def __init__(self, name: str, file, content_type: str = None, cache: Optional[ArtifactCache] = None):
+        super().__init__(name, file, content_type, cache=cache)
         self.extension = "pickle"
 
     def _render(self):
-        return pickle.load(self.file)
+        with self._open() as file:
+            return pickle.load(file)
+
+
+class _TableArtifact(Artifact):
+    """Base class of artifacts that are read into Arrow tables."""
+
+    def __init__(self, name: str, file, content_type: str = None, cache: Optional[ArtifactCache] = None):
+        super().__init__(name, file, content_type, cache=cache)
+        self._tables: Dict[Hashable, "pa.Table"] = {}
+
+    def _render(self):
+        return self.to_frame()
+
+    @contextmanager
+    def _open_arrow_source(self):
+        # Local files are memory-mapped, GridFS files are read with seeks.
+        pa = _import_pyarrow()
+        if self._content is not None:
+            yield pa.BufferReader(self._content)
+            return
+        local_path = self._local_path()
+        if local_path is not None:
+            with pa.memory_map(str(local_path)) as source:
+                yield source
+        else:
+            with self._open() as file:
+                yield file
+
+
+class ParquetArtifact(_TableArtifact):
+    """Displays and saves a Parquet artifact. Requires pyarrow."""
+
+    can_render = {"application/vnd.apache.parquet", "application/parquet", "application/x-parquet"}
+
+    def __init__(self, name: str, file, content_type: str = None, cache: Optional[ArtifactCache] = None):
+        super().__init__(name, file, content_type, cache=cache)
+        self.extension = "parquet"
+
+    def to_table(
+        self, columns: Optional[Sequence[str]] = None, row_groups: Optional[Sequence[int]] = None
+    ) -> "pa.Table":
+        """
+        Read the Parquet file into an Arrow table.
+
+        Only the footer and the requested column chunks are read, also when the file is streamed from GridFS.
+        Tables are memoized per combination of arguments.
+
+        Args:
+            columns: The columns to read. All columns if None.
+            row_groups: The indices of the row groups to read. All row groups if None.
+
+        Returns:
+            The table.
+        """
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        key = _make_key((columns, row_groups))
+        if key not in self._tables:
+            with self._open_arrow_source() as source:
+                parquet_file = pq.ParquetFile(source)
+                if row_groups is None:
+                    self._tables[key] = parquet_file.read(columns=columns)
+                else:
+                    self._tables[key] = parquet_file.read_row_groups(row_groups, columns=columns)
+        return self._tables[key]
+
+    def to_frame(
+        self, columns: Optional[Sequence[str]] = None, row_groups: Optional[Sequence[int]] = None
+    ) -> pd.DataFrame:
+        """Read the Parquet file into a dataframe. See `to_table` for the arguments."""
+        return self.to_table(columns=columns, row_groups=row_groups).to_pandas()
+
+
+class ArrowArtifact(_TableArtifact):
+    """Displays and saves an Arrow IPC artifact, which includes the Feather format. Requires pyarrow."""
+
+    can_render = {
+        "application/vnd.apache.arrow.file",
+        "application/vnd.apache.arrow.stream",
+        "application/x-feather",
+        "application/feather",
+    }
+
+    def __init__(self, name: str, file, content_type: str = None, cache: Optional[ArtifactCache] = None):
+        super().__init__(name, file, content_type, cache=cache)
+        self.extension = "arrow"
+
+    def to_table(
+        self, columns: Optional[Sequence[str]] = None, record_batches: Optional[Sequence[int]] = None
+    ) -> "pa.Table":
+        """
+        Read the Arrow IPC file into an Arrow table.
+
+        Local files are memory-mapped, so that only the requested columns are paged in.
+        Tables are memoized per combination of arguments.
+
+        Args:
+            columns: The columns to read. All columns if None.
+            record_batches: The indices of the record batches to read. All record batches if None.
+                            Only supported for the file format, not for the stream format.
+
+        Returns:
+            The table.
+        """
+        pa = _import_pyarrow()
+
+        key = _make_key((columns, record_batches))
+        if key not in self._tables:
+            with self._open_arrow_source() as source:
+                if self.content_type == "application/vnd.apache.arrow.stream":
+                    if record_batches is not None:
+                        raise ValueError("Record batches cannot be selected from the Arrow stream format.")
+                    table = pa.ipc.open_stream(source).read_all()
+                else:
+                    reader = pa.ipc.open_file(source)
+                    if record_batches is None:
+                        table = reader.read_all()
+                    else:
+                        table = pa.Table.from_batches(
+                            [reader.get_batch(i) for i in record_batches], schema=reader.schema
+                        )
+                self._tables[key] = table if columns is None else table.select(list(columns))
+        return self._tables[key]
+
+    def to_frame(
+        self, columns: Optional[Sequence[str]] = None, record_batches: Optional[Sequence[int]] = None
+    ) -> pd.DataFrame:
+        """Read the Arrow IPC file into a dataframe. See `to_table` for the arguments."""
+        return self.to_table(columns=columns, record_batches=record_batches).to_pandas()
 
 
 class PDFArtifact(Artifact):
@@ -145,3 +458,29 @@ for cls in copy(locals()).values():
     if isinstance(cls, type) and issubclass(cls, Artifact):
         for content_type in cls.can_render:
             content_type_to_artifact_cls[content_type] = cls
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Parquet and Arrow artifacts require pyarrow. Install it with `pip install incense[arrow]`."
+        ) from e
+    return pyarrow
+
+
+def _make_key(value: Any) -> Hashable:
+    """Turn nested arguments into a hashable key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _make_key(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_make_key(item) for item in value)
+    return value
+
+
+def _read_chunks(file: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    chunk = file.read(chunk_size)
+    while chunk:
+        yield chunk
+        chunk = file.read(chunk_size)
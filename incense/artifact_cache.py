@@ -0,0 +1,104 @@
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import *
+
+DEFAULT_ARTIFACT_CACHE_SIZE = 10 * 2**30
+
+
+class ArtifactCache:
+    """Keeps downloaded artifact files in a local directory, so that they are only downloaded once.
+
+    Files are named after the md5 checksum of their content if GridFS stored one, and otherwise
+    after their GridFS file id. The modification time of a file records its last access. Once the total size
+    of the files exceeds `max_size` bytes, the least recently used files are evicted. As all bookkeeping
+    is done on the file system, the cache can be shared by several processes.
+    """
+
+    def __init__(self, cache_dir: Union[Path, str], max_size: int = DEFAULT_ARTIFACT_CACHE_SIZE):
+        self.path = Path(cache_dir).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}("{self.path}")'
+
+    @property
+    def size(self) -> int:
+        """The total size of all cached files in bytes."""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the path of the file cached for key, or None if it is not cached."""
+        path = self.path / key
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, chunks: Iterable[bytes]) -> Path:
+        """Write a file to the cache and evict other files if the cache grew too large.
+
+        Args:
+            key: The name of the file.
+            chunks: The content of the file.
+
+        Returns:
+            The path of the cached file.
+        """
+        path = self.path / key
+        temp_path = self.path / f".{key}.{uuid.uuid4().hex}.part"
+        try:
+            with open(temp_path, "xb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+            os.replace(temp_path, path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        self._evict(keep=path)
+        return path
+
+    def clear(self) -> None:
+        """Remove all cached files."""
+        for entry in self._entries():
+            _unlink(entry)
+
+    def _entries(self) -> List[Path]:
+        return [entry for entry in self.path.iterdir() if entry.is_file() and not entry.name.startswith(".")]
+
+    def _evict(self, keep: Path) -> None:
+        with self._lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    entries.append((entry.stat(), entry))
+                except FileNotFoundError:
+                    # Evicted by another process in the meantime.
+                    continue
+            size = sum(stat.st_size for stat, _ in entries)
+            for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+                if size <= self.max_size:
+                    break
+                if entry != keep:
+                    _unlink(entry)
+                    size -= stat.st_size
+
+
+def link_or_copy(source: Path, destination: str) -> None:
+    """Hardlink a file, or copy it if the file system does not support hardlinks between the two paths."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,299 @@
+import asyncio
+import importlib
+import io
+from typing import *
+
+from pymongo import DESCENDING
+
+from .cache import MISSING, CacheInfo, ResultCache
+from .experiment import Experiment, make_artifact, metric_db_entry_to_series
+from .experiment_loader import DEFAULT_RUNNING_TTL, FIND_BY_IDS_BATCH_SIZE, MAX_CACHE_SIZE, _sizeof
+from .persistent_cache import is_final
+from .query_set import QuerySet, _batched
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+except ImportError as e:
+    raise ImportError("AsyncExperimentLoader requires motor. Install it with `pip install incense[async]`.") from e
+
+# Upper bound on the number of artifacts `load_artifacts` downloads at once.
+MAX_CONCURRENT_DOWNLOADS = 8
+
+
+class AsyncExperimentLoader:
+    """Loads experiments with motor, so that many requests can be served concurrently from one event loop.
+
+    The coroutines mirror the find methods of `ExperimentLoader` and return the same `Experiment` and `QuerySet`
+    objects, which always contain the complete run documents. Metrics and artifacts are not retrieved when
+    they are accessed, but have to be loaded with `load_metrics` and `load_artifacts` beforehand.
+    """
+
+    def __init__(
+        self,
+        mongo_uri=None,
+        db_name="sacred",
+        unpickle: bool = True,
+        max_cache_entries: Optional[int] = MAX_CACHE_SIZE,
+        max_cache_bytes: Optional[int] = None,
+        running_ttl: Optional[float] = DEFAULT_RUNNING_TTL,
+        **mongo_client_kwargs,
+    ):
+        """
+        Args:
+            mongo_uri: The uri of the mongo server.
+            db_name: The name of the database sacred writes to.
+            unpickle: Whether to restore objects that sacred stored in the info dict.
+            max_cache_entries: The maximum number of experiments kept in memory by `find_by_id` and `find_by_ids`.
+            max_cache_bytes: The maximum estimated size of the experiments kept in memory.
+            running_ttl: Seconds after which unfinished runs are retrieved again.
+                         None to keep them until the cache is cleared.
+            mongo_client_kwargs: Additional arguments for the motor client.
+        """
+        self._mongo_uri = mongo_uri
+        self._db_name = db_name
+        self._mongo_client_kwargs = mongo_client_kwargs
+        # Motor clients are bound to an event loop, so they are only created inside of the loop that uses them.
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Reimport sacred to make sure that custom handlers for
+        # jsonpickle are enabled.
+        if unpickle:
+            import sacred.serializer
+
+            importlib.reload(sacred.serializer)
+        self._unpickle = unpickle
+        self._cache = ResultCache(max_entries=max_cache_entries, max_bytes=max_cache_bytes, sizeof=_sizeof)
+        self._running_ttl = running_ttl
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(db_name="{self._db_name}")'
+
+    @property
+    def _database(self):
+        """The database on a client of the running event loop, which replaces the client of a former loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                self._client.close()
+            self._client = AsyncIOMotorClient(self._mongo_uri, **self._mongo_client_kwargs)
+            self._client_loop = loop
+        return self._client[self._db_name]
+
+    @property
+    def _runs(self):
+        return self._database.runs
+
+    @property
+    def _grid_filesystem(self):
+        return AsyncIOMotorGridFSBucket(self._database)
+
+    async def find_by_id(self, experiment_id: int) -> Experiment:
+        """
+        Find experiment based on its id.
+
+        Args:
+            experiment_id: The id  of the experiment.
+
+        Returns:
+            The experiment corresponding to the id.
+        """
+        experiments = await self._find_by_ids([experiment_id])
+        if experiment_id not in experiments:
+            raise ValueError(f'Experiment with id {experiment_id} does not exist in database "{self._db_name}".')
+        return experiments[experiment_id]
+
+    async def find_by_ids(self, experiment_ids: Iterable[int]) -> QuerySet:
+        """
+        Find experiments based on a collection of ids.
+
+        Args:
+            experiment_ids: Iterable of experiment ids.
+
+        Returns:
+            The experiments corresponding to the ids, in the order of the given ids.
+        """
+        experiment_ids = list(experiment_ids)
+        experiments = await self._find_by_ids(experiment_ids)
+        not_found = [
+            experiment_id for experiment_id in dict.fromkeys(experiment_ids) if experiment_id not in experiments
+        ]
+        if not_found:
+            raise ValueError(f'Experiments with ids {not_found} do not exist in database "{self._db_name}".')
+        return QuerySet([experiments[experiment_id] for experiment_id in experiment_ids])
+
+    async def find_all(self) -> QuerySet:
+        """
+        Find all experiments stored in the database.
+
+        Returns:
+            All experiments.
+        """
+        return await self.find({})
+
+    async def find_latest(self, n: int = 1, attr: str = "start_time") -> Union[Experiment, QuerySet]:
+        """Find the most recent experiments.
+
+        Args:
+            n: The number of latest experiments to retrieve.
+            attr: The attribute to determine which experiments are the most recent ones.
+
+        Returns:
+            Either the latest experiment or the set of latest experiments in case more than one were requested.
+        """
+        runs = await self._runs.find({}, sort=[(attr, DESCENDING)], limit=n).to_list(None)
+        experiments = [self._make_experiment(run) for run in runs]
+        if len(experiments) == 1:
+            return experiments[0]
+        else:
+            return QuerySet(experiments)
+
+    async def find(self, query: dict) -> QuerySet:
+        """Find experiments based on a mongo query.
+
+        Args:
+            query: An arbitrary mongo query.
+
+        Returns:
+            The matched experiments.
+        """
+        runs = await self._runs.find(query).to_list(None)
+        return QuerySet([self._make_experiment(run) for run in runs], query=query)
+
+    async def load_metrics(self, experiments: Iterable[Experiment], names: Optional[Iterable[str]] = None) -> None:
+        """Load the metrics of many experiments, with one concurrent query per batch of experiments.
+
+        Args:
+            experiments: The experiments whose metrics are loaded.
+            names: Names of the metrics to load. Defaults to all metrics.
+        """
+        names = None if names is None else set(names)
+        pending = {
+            experiment.id: experiment
+            for experiment in experiments
+            if not experiment._all_metrics_loaded and (names is None or not names.issubset(experiment._metrics))
+        }
+        batches = await asyncio.gather(
+            *(self._find_metrics(run_ids, names) for run_ids in _batched(pending, FIND_BY_IDS_BATCH_SIZE))
+        )
+        for metric_db_entries in batches:
+            for metric_db_entry in metric_db_entries:
+                experiment = pending[metric_db_entry["run_id"]]
+                experiment._metrics.setdefault(metric_db_entry["name"], metric_db_entry_to_series(metric_db_entry))
+        if names is None:
+            for experiment in pending.values():
+                experiment._all_metrics_loaded = True
+
+    async def load_artifacts(
+        self,
+        experiments: Iterable[Experiment],
+        names: Optional[Iterable[str]] = None,
+        n_concurrent: int = MAX_CONCURRENT_DOWNLOADS,
+    ) -> None:
+        """Download the artifacts of many experiments concurrently.
+
+        The content of every downloaded artifact is kept in memory, so leave out large artifacts,
+        e.g. checkpoints, with `names`.
+
+        Args:
+            experiments: The experiments whose artifacts are loaded.
+            names: Names of the artifacts to load. Defaults to all artifacts. `exp.artifacts` only contains
+                   the artifacts loaded so far, and loaded artifacts are not downloaded again.
+            n_concurrent: The maximum number of artifacts that are downloaded at once.
+        """
+        names = None if names is None else set(names)
+        experiments = list(experiments)
+        links = [
+            (experiment, link)
+            for experiment in experiments
+            for link in experiment._get_artifacts_links()
+            if (names is None or link["name"] in names) and link["name"] not in (experiment._artifacts or {})
+        ]
+        semaphore = asyncio.Semaphore(n_concurrent)
+
+        async def download(file_id):
+            async with semaphore:
+                return await self._download(file_id)
+
+        files = await asyncio.gather(*(download(link["file_id"]) for _, link in links))
+        artifacts = {id(experiment): experiment._artifacts or {} for experiment in experiments}
+        for (experiment, link), artifact_file in zip(links, files):
+            artifacts[id(experiment)][link["name"]] = make_artifact(link["name"], artifact_file)
+        for experiment in experiments:
+            experiment._artifacts = artifacts[id(experiment)]
+
+    def cache_clear(self):
+        """Clear the cache of `find_by_id` and `find_by_ids`."""
+        self._cache.clear()
+
+    def cache_info(self) -> CacheInfo:
+        """Report hits, misses, evictions and size of the cache of `find_by_id` and `find_by_ids`."""
+        return self._cache.info()
+
+    async def _find_by_ids(self, experiment_ids: List[int]) -> Dict[int, Experiment]:
+        unique_ids = list(dict.fromkeys(experiment_ids))
+        experiments = {}
+        for experiment_id in unique_ids:
+            experiment = self._cache.get(("find_by_id", experiment_id))
+            if experiment is not MISSING:
+                experiments[experiment_id] = experiment
+        missing = [experiment_id for experiment_id in unique_ids if experiment_id not in experiments]
+        batches = await asyncio.gather(
+            *(
+                self._runs.find({"_id": {"$in": run_ids}}).to_list(None)
+                for run_ids in _batched(missing, FIND_BY_IDS_BATCH_SIZE)
+            )
+        )
+        for runs in batches:
+            for run in runs:
+                experiment = self._make_experiment(run)
+                ttl = None if is_final(run) else self._running_ttl
+                self._cache.put(("find_by_id", experiment.id), experiment, ttl=ttl)
+                experiments[experiment.id] = experiment
+        return experiments
+
+    async def _find_metrics(self, run_ids: List[int], names: Optional[Collection[str]]) -> List[dict]:
+        query: Dict[str, Any] = {"run_id": {"$in": run_ids}}
+        if names is not None:
+            query["name"] = {"$in": list(names)}
+        return await self._database.metrics.find(query).to_list(None)
+
+    async def _download(self, file_id) -> "_DownloadedFile":
+        grid_out = await self._grid_filesystem.open_download_stream(file_id)
+        return _DownloadedFile(await grid_out.read(), name=grid_out.filename, content_type=grid_out.content_type)
+
+    def _make_experiment(self, run: dict) -> Experiment:
+        # Experiments of this loader cannot access the database synchronously.
+        return Experiment(
+            run["_id"],
+            _SYNC_ACCESS_UNAVAILABLE,
+            _SYNC_ACCESS_UNAVAILABLE,
+            run,
+            run.get("artifacts", []),
+            loader=_SYNC_ACCESS_UNAVAILABLE,
+            unpickle=self._unpickle,
+        )
+
+
+class _DownloadedFile(io.BytesIO):
+    """The content of a GridFS file in memory, together with the attributes of a `GridOut` that artifacts use."""
+
+    def __init__(self, content: bytes, name: str, content_type: Optional[str]):
+        super().__init__(content)
+        self.name = name
+        self.content_type = content_type
+
+
+class _SyncAccessUnavailable:
+    """Stands in for the database, file system and loader of experiments retrieved by an `AsyncExperimentLoader`."""
+
+    def __getattr__(self, item):
+        if item.startswith("__"):
+            raise AttributeError(item)
+        raise RuntimeError(
+            "Experiments of an AsyncExperimentLoader cannot access the database on their own. "
+            "Load their metrics and artifacts with `await loader.load_metrics(...)` "
+            "and `await loader.load_artifacts(...)` first."
+        )
+
+
+_SYNC_ACCESS_UNAVAILABLE = _SyncAccessUnavailable()
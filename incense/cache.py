@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import *
+
+MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    nbytes: int
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+
+
+class ResultCache:
+    """A least recently used cache with an entry and a byte budget and optional expiry per entry.
+
+    Args:
+        max_entries: The maximum number of entries. Unbounded if None.
+        max_bytes: The maximum total size of all entries as determined by `sizeof`. Unbounded if None.
+        sizeof: Estimates the size of a value in bytes. Only called if `max_bytes` is set.
+        timer: Clock used to expire entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = lambda value: 0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._timer = timer
+        self._lock = threading.RLock()
+        # Maps keys to tuples of value, size and expiry time.
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.info()})"
+
+    def get(self, key: Hashable) -> Any:
+        """Return the value cached for key or `MISSING`."""
+        with self._lock:
+            if key not in self._entries or self._expired(key):
+                self._misses += 1
+                return MISSING
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value, which expires after `ttl` seconds if given."""
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        expires = None if ttl is None else self._timer() + ttl
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, size, expires)
+            self._nbytes += size
+            while self._entries and self._over_budget():
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Remove the value cached for key, if any."""
+        with self._lock:
+            self._remove(key)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Return the keys and values of all entries that have not expired, without counting them as hits."""
+        with self._lock:
+            return [(key, entry[0]) for key, entry in list(self._entries.items()) if not self._expired(key)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def info(self) -> CacheInfo:
+        """Report the effectiveness of the cache, similar to `functools.lru_cache`."""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                len(self._entries),
+                self._nbytes,
+                self.max_entries,
+                self.max_bytes,
+            )
+
+    def _expired(self, key: Hashable) -> bool:
+        expires = self._entries[key][2]
+        if expires is not None and self._timer() >= expires:
+            self._remove(key)
+            self._expirations += 1
+            return True
+        return False
+
+    def _over_budget(self) -> bool:
+        return (self.max_entries is not None and len(self._entries) > self.max_entries) or (
+            self.max_bytes is not None and self._nbytes > self.max_bytes
+        )
+
+    def _remove(self, key: Hashable) -> None:
+        if key in self._entries:
+            _, size, _ = self._entries.pop(key)
+            self._nbytes -= size
@@ -0,0 +1,92 @@
+import numpy as np
+
+
+def _check_max_points(max_points: int) -> None:
+    if max_points < 1:
+        raise ValueError(f"max_points must be at least 1, but was {max_points}.")
+
+
+def stride(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Select every k-th point, so that at most `max_points` points remain.
+
+    Returns:
+        The indices of the selected points.
+
+    Raises:
+        ValueError: If `max_points` is smaller than 1.
+    """
+    _check_max_points(max_points)
+    k = max(1, int(np.ceil(len(x) / max_points)))
+    return np.arange(0, len(x), k)
+
+
+def minmax(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Select the minimum and the maximum of equally sized buckets, keeping at most `max_points` points.
+
+    Returns:
+        The indices of the selected points.
+
+    Raises:
+        ValueError: If `max_points` is smaller than 1.
+    """
+    _check_max_points(max_points)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    if max_points == 1:
+        # A bucket contributes two points, so only a single point can be kept.
+        return stride(x, y, max_points)
+    n_buckets = max(1, max_points // 2)
+    bucket_size = int(np.ceil(n / n_buckets))
+    n_buckets = int(np.ceil(n / bucket_size))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    with np.errstate(invalid="ignore"):
+        filled_min = np.where(np.isnan(buckets), np.inf, buckets)
+        filled_max = np.where(np.isnan(buckets), -np.inf, buckets)
+    indices = np.concatenate([offsets + filled_min.argmin(axis=1), offsets + filled_max.argmax(axis=1)])
+    return np.unique(indices[indices < n])
+
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Select points with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and the last point are always kept. From each bucket in between, the point
+    is selected that forms the largest triangle with the previously selected point and
+    the average of the next bucket, which preserves the visual shape of the curve.
+
+    Returns:
+        The indices of the selected points.
+
+    Raises:
+        ValueError: If `max_points` is smaller than 1.
+    """
+    _check_max_points(max_points)
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return stride(x, y, max_points) if max_points < 3 else np.arange(n)
+    x = x.astype(float)
+    y = y.astype(float)
+    # Bucket boundaries for all points but the first and the last one.
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        next_x = np.nanmean(x[next_start:next_stop])
+        next_y = np.nanmean(y[next_start:next_stop])
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i + 1] = previous
+    return selected
+
+
+methods = {"lttb": lttb, "stride": stride, "minmax": minmax}
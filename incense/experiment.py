@@ -2,40 +2,111 @@ import json
 from pathlib import Path
 from typing import *
 
-import jsonpickle
+import bson
+import numpy as np
 import pandas as pd
-from pyrsistent import freeze, thaw
+from jsonpickle.unpickler import Unpickler
 
+from incense import downsample
 from incense.artifact import Artifact, content_type_to_artifact_cls
+from incense.artifact_cache import ArtifactCache
+from incense.frozen import freeze, thaw
+
+
+# A projection of run documents, as pairs of top-level fields and 1 to include or 0 to exclude them.
+ProjectionT = Tuple[Tuple[str, int], ...]
 
 
 class Experiment:
-    def __init__(self, id_, database, grid_filesystem, data, artifact_links, loader):
+    def __init__(
+        self,
+        id_,
+        database,
+        grid_filesystem,
+        data,
+        artifact_links,
+        loader,
+        unpickle: bool = True,
+        projection: Optional[ProjectionT] = None,
+    ):
         self.id = id_
         self._database = database
         self._grid_filesystem = grid_filesystem
-        self._data = data
+        # The run document is only wrapped into a read-only view, so that fields
+        # retrieved later on can still be added to it.
+        self._document = data
+        self._data = freeze(data)
         self._artifacts_links = artifact_links
         self._loader = loader
-        self._artifacts = None
-        self._metrics = None
+        self._unpickle = unpickle
+        # The projection `data` was retrieved with, if it only contains part of the run document.
+        self._projection = projection
+        self._partial = projection is not None
+        self._fetched_fields: Set[str] = set()
+        # The raw info dict is only decoded with jsonpickle when `info` is accessed.
+        self._raw_info = data.get("info")
+        self._info = None
+        self._artifacts: Optional[Dict[str, Artifact]] = None
+        # Metrics can also be filled in bulk by `QuerySet.load_metrics`, possibly only for some names.
+        self._metrics: Dict[str, pd.Series] = {}
+        self._all_metrics_loaded = False
 
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id}, name={self.experiment.name})"
 
     def __getattr__(self, item):
         """Try to relay attribute access to easy dict, to allow dotted access."""
-        return getattr(self._data, item)
+        if item.startswith("__") or "_data" not in self.__dict__:
+            raise AttributeError(item)
+        try:
+            return getattr(self._data, item)
+        except AttributeError:
+            # Private names, e.g. those IPython probes for, are never fetched from the database.
+            if item.startswith("_") or not self._partial or item in self._fetched_fields:
+                raise
+            self._fetch_fields(item)
+            return getattr(self._data, item)
 
     @classmethod
-    def from_db_object(cls, database, grid_filesystem, experiment_data: dict, loader, unpickle: bool = True):
-        if unpickle:
-            experiment_data["info"] = jsonpickle.loads(json.dumps(experiment_data["info"]))
-        data = freeze(experiment_data)
-
-        artifacts_links = experiment_data["artifacts"]
+    def from_db_object(
+        cls,
+        database,
+        grid_filesystem,
+        experiment_data: dict,
+        loader,
+        unpickle: bool = True,
+        projection: Optional[ProjectionT] = None,
+    ):
+        artifacts_links = experiment_data.get("artifacts")
         id_ = experiment_data["_id"]
-        return cls(id_, database, grid_filesystem, data, artifacts_links, loader)
+        return cls(
+            id_,
+            database,
+            grid_filesystem,
+            experiment_data,
+            artifacts_links,
+            loader,
+            unpickle=unpickle,
+            projection=projection,
+        )
+
+    @property
+    def info(self):
+        """
+        The info dict of the experiment.
+
+        If the experiment was loaded with `unpickle=True`, objects stored by sacred
+        are restored with jsonpickle the first time the info is accessed.
+        """
+        if not self._unpickle:
+            return self.__getattr__("info")
+        if self._info is None:
+            if self._raw_info is None and self._partial and "info" not in self._fetched_fields:
+                self._fetch_fields("info")
+            if self._raw_info is None:
+                raise AttributeError("info")
+            self._info = freeze(_decode_info(self._raw_info))
+        return self._info
 
     @property
     def artifacts(self) -> Dict[str, Artifact]:
@@ -60,18 +131,73 @@ class Experiment:
             A mapping from metric names to pandas Series objects, that
             belong to the experiment.
         """
-        if self._metrics is None:
-            self._metrics = self._load_metrics()
+        if not self._all_metrics_loaded:
+            for name, metric in self._load_metrics().items():
+                self._metrics.setdefault(name, metric)
+            self._all_metrics_loaded = True
 
         return self._metrics
 
+    def get_metric(
+        self,
+        name: str,
+        start_step: Optional[int] = None,
+        end_step: Optional[int] = None,
+        max_points: Optional[int] = None,
+        method: str = "lttb",
+    ) -> pd.Series:
+        """
+        Retrieve a single metric, optionally restricted to a range of steps and downsampled.
+
+        Unless the metric was already loaded, the steps are selected inside the database, as is
+        downsampling with the "stride" method, so that only the selected points are transferred.
+
+        Args:
+            name: The name of the metric.
+            start_step: The first step to include.
+            end_step: The last step to include.
+            max_points: The maximum number of points to return.
+            method: {"lttb", "stride", "minmax"} How to downsample the metric to `max_points` points.
+
+        Returns:
+            The metric as pandas Series indexed by step.
+        """
+        if method not in downsample.methods:
+            raise ValueError(f"method can be one of {list(downsample.methods)}, but was {method}.")
+        if max_points is not None and max_points < 1:
+            raise ValueError(f"max_points must be at least 1, but was {max_points}.")
+
+        if name in self._metrics:
+            metric = self._metrics[name]
+            steps, values = metric.index.to_numpy(), metric.to_numpy()
+            in_range = np.ones(len(steps), dtype=bool)
+            if start_step is not None:
+                in_range &= steps >= start_step
+            if end_step is not None:
+                in_range &= steps <= end_step
+            steps, values = steps[in_range], values[in_range]
+        else:
+            stride_to = max_points if method == "stride" else None
+            metric_db_entry = self._find_metric(name, start_step, end_step, stride_to)
+            steps, values = np.asarray(metric_db_entry["steps"]), np.asarray(metric_db_entry["values"])
+
+        if max_points is not None and len(steps) > max_points:
+            selected = downsample.methods[method](steps, values, max_points)
+            steps, values = steps[selected], values[selected]
+        return pd.Series(data=values, index=pd.Index(steps, name="step"), name=name)
+
     def to_dict(self) -> dict:
         """Convert the experiment to a dictionary.
 
         Returns:
             A dict with all data from the sacred data model.
         """
-        return thaw(self._data)
+        if self._partial:
+            self._fetch_fields()
+        experiment_dict = thaw(self._data)
+        if self._unpickle and "info" in experiment_dict:
+            experiment_dict["info"] = thaw(self.info)
+        return experiment_dict
 
     def delete(self, confirmed: bool = False):
         """Delete run together with its artifacts and metrics.
@@ -84,19 +210,65 @@ class Experiment:
         if confirmed:
             self._delete()
 
+    def _size(self) -> int:
+        """Estimate the memory held by the experiment by the size of its run document."""
+        return len(bson.encode(self._document))
+
+    def _fetch_fields(self, *fields: str):
+        """Retrieve fields that were left out by a projection, or all of them if no fields are given."""
+        projection = {field: 1 for field in fields} if fields else None
+        run = self._database.runs.find_one({"_id": self.id}, projection)
+        if run is None:
+            raise ValueError(f'Experiment with id {self.id} does not exist in database "{self._database.name}".')
+        self._merge_fields(run, fields)
+
+    def _merge_fields(self, run: dict, fields: Collection[str]):
+        """Add the fields of a projection of the run document that were left out before."""
+        missing = {key: value for key, value in run.items() if key not in self._document}
+        self._document.update(missing)
+        if "info" in missing:
+            self._raw_info = missing["info"]
+        if fields:
+            self._fetched_fields.update(fields)
+        else:
+            self._partial = False
+
+    def _is_missing(self, field: str) -> bool:
+        """Whether a top-level field was left out by a projection and was not fetched yet."""
+        return self._partial and field not in self._document and field not in self._fetched_fields
+
+    def _update(self, run: dict, keep_metrics: bool = False):
+        """Replace the run document with a newer version of it and forget everything derived from the old one.
+
+        Args:
+            run: The new run document, retrieved with the projection of the experiment or in full.
+            keep_metrics: Whether the loaded metrics are kept, because they are extended elsewhere.
+        """
+        self._document = run
+        self._data = freeze(run)
+        self._partial = self._projection is not None
+        self._fetched_fields = set()
+        self._raw_info = run.get("info")
+        self._info = None
+        self._artifacts_links = run.get("artifacts")
+        self._artifacts = None
+        if not keep_metrics:
+            self._metrics.clear()
+            self._all_metrics_loaded = False
+
+    def _get_artifacts_links(self) -> List[dict]:
+        if self._artifacts_links is None:
+            run = self._database.runs.find_one({"_id": self.id}, {"artifacts": 1})
+            self._artifacts_links = [] if run is None else run.get("artifacts", [])
+        return self._artifacts_links
+
     def _load_artifacts(self) -> Dict[str, Artifact]:
         artifacts = {}
-        for artifact_link in self._artifacts_links:
+        for artifact_link in self._get_artifacts_links():
             artifact_file = self._grid_filesystem.get(artifact_link["file_id"])
-            name = artifact_link["name"]
-
-            try:
-                content_type = artifact_file.content_type
-                artifact_type = content_type_to_artifact_cls[content_type]
-                artifacts[name] = artifact_type(name, artifact_file, content_type=content_type)
-            except KeyError:
-                artifact_type = Artifact
-                artifacts[name] = artifact_type(name, artifact_file)
+            artifacts[artifact_link["name"]] = make_artifact(
+                artifact_link["name"], artifact_file, cache=self._loader._artifact_cache
+            )
 
         return artifacts
 
@@ -104,24 +276,34 @@ class Experiment:
         self._delete_artifacts()
         self._delete_metrics()
         self._database.runs.delete_one({"_id": self.id})
-        self._loader.cache_clear()
+        self._loader._discard(self.id)
 
     def _load_metrics(self) -> Dict[str, pd.Series]:
         metrics = {}
-        metric_db_entries = self._database.metrics.find({"run_id": self.id})
+        metric_db_entries = self._loader._find_metrics({self.id: self})
         for metric_db_entry in metric_db_entries:
-            metrics[metric_db_entry["name"]] = pd.Series(
-                data=metric_db_entry["values"],
-                index=pd.Index(metric_db_entry["steps"], name="step"),
-                name=metric_db_entry["name"],
-            )
+            metrics[metric_db_entry["name"]] = metric_db_entry_to_series(metric_db_entry)
         return metrics
 
+    def _find_metric(
+        self, name: str, start_step: Optional[int], end_step: Optional[int], stride_to: Optional[int]
+    ) -> dict:
+        query = {"run_id": self.id, "name": name}
+        if start_step is None and end_step is None and stride_to is None:
+            metric_db_entry = self._database.metrics.find_one(query, {"steps": 1, "values": 1})
+        else:
+            metric_db_entry = next(
+                self._database.metrics.aggregate(_metric_pipeline(query, start_step, end_step, stride_to)), None
+            )
+        if metric_db_entry is None:
+            raise KeyError(name)
+        return metric_db_entry
+
     def _delete_metrics(self):
         self._database.metrics.delete_many({"run_id": self.id})
 
     def _delete_artifacts(self):
-        for artifact_link in self._artifacts_links:
+        for artifact_link in self._get_artifacts_links():
             self._grid_filesystem.delete(artifact_link["file_id"])
 
 
@@ -176,6 +358,66 @@ class FileSystemExperiment:
         return artifacts
 
 
+def metric_db_entry_to_series(metric_db_entry: dict) -> pd.Series:
+    """Turn a document of the metrics collection into a series indexed by step."""
+    return pd.Series(
+        data=metric_db_entry["values"],
+        index=pd.Index(metric_db_entry["steps"], name="step"),
+        name=metric_db_entry["name"],
+    )
+
+
+def make_artifact(name: str, artifact_file, cache: Optional[ArtifactCache] = None) -> Artifact:
+    """Wrap a GridFS file into the artifact class that matches its content type."""
+    try:
+        content_type = artifact_file.content_type
+        artifact_type = content_type_to_artifact_cls[content_type]
+        return artifact_type(name, artifact_file, content_type=content_type, cache=cache)
+    except KeyError:
+        return Artifact(name, artifact_file, cache=cache)
+
+
+def _metric_pipeline(
+    query: dict, start_step: Optional[int], end_step: Optional[int], stride_to: Optional[int]
+) -> List[dict]:
+    """Build an aggregation pipeline that selects a range of steps of a metric and optionally strides over them."""
+    step = {"$arrayElemAt": ["$steps", "$$i"]}
+    conditions = []
+    if start_step is not None:
+        conditions.append({"$gte": [step, start_step]})
+    if end_step is not None:
+        conditions.append({"$lte": [step, end_step]})
+    indices: dict = {"$range": [0, {"$size": "$steps"}]}
+    if conditions:
+        indices = {"$filter": {"input": indices, "as": "i", "cond": {"$and": conditions}}}
+
+    pipeline = [{"$match": query}, {"$project": {"steps": 1, "values": 1, "indices": indices}}]
+    if stride_to is not None:
+        stride = {"$max": [1, {"$toInt": {"$ceil": {"$divide": [{"$size": "$indices"}, stride_to]}}}]}
+        strided_indices = {
+            "$map": {
+                "input": {"$range": [0, {"$size": "$indices"}, stride]},
+                "as": "j",
+                "in": {"$arrayElemAt": ["$indices", "$$j"]},
+            }
+        }
+        pipeline.append({"$project": {"steps": 1, "values": 1, "indices": strided_indices}})
+    pipeline.append(
+        {
+            "$project": {
+                "_id": 0,
+                "steps": {"$map": {"input": "$indices", "as": "i", "in": {"$arrayElemAt": ["$steps", "$$i"]}}},
+                "values": {"$map": {"input": "$indices", "as": "i", "in": {"$arrayElemAt": ["$values", "$$i"]}}},
+            }
+        }
+    )
+    return pipeline
+
+
+def _decode_info(info: dict) -> Any:
+    return Unpickler().restore(info, reset=True)
+
+
 def _load_json_from_path(path: Path) -> Any:
     with path.open() as f:
         return json.load(f)
@@ -1,23 +1,86 @@
 import importlib
 import numbers
-from functools import lru_cache
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import partial, wraps
 from pathlib import Path
 from typing import *
 
 import gridfs
-from pymongo import DESCENDING
+import pandas as pd
+from pymongo import ASCENDING, DESCENDING, uri_parser
 from pymongo.mongo_client import MongoClient
 
-from .experiment import Experiment, FileSystemExperiment
-from .query_set import QuerySet
+from . import indexes
+from .artifact_cache import DEFAULT_ARTIFACT_CACHE_SIZE, ArtifactCache
+from .cache import MISSING, CacheInfo, ResultCache
+from .experiment import Experiment, FileSystemExperiment, ProjectionT
+from .persistent_cache import DEFAULT_PERSISTENT_CACHE_SIZE, PersistentCache, is_final
+from .projection import make_frame, make_projection_pipeline, read_projection
+from .query_set import LAZY_BATCH_SIZE, LazyQuerySet, QuerySet, ReducerT, StrOrTupleT, _batched
+from .watch import Watcher
 
 MAX_CACHE_SIZE = 32
+# Seconds after which cached results that contain unfinished runs are retrieved again.
+DEFAULT_RUNNING_TTL = 30.0
+# Upper bound on the number of ids sent to the database in a single `$in` query.
+FIND_BY_IDS_BATCH_SIZE = 1000
+# Margin for clocks of the machines running experiments that are behind the clock of this machine.
+CLOCK_SKEW_TOLERANCE = timedelta(seconds=5)
+ALWAYS_INCLUDED_FIELDS = ("experiment", "artifacts")
+MATCH_MODES = ("regex", "exact", "prefix", "text")
+
+
+def _cached(method):
+    """Cache the results of a loader method in the cache of the loader instance."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, *args, *sorted(kwargs.items()))
+        result = self._cache.get(key)
+        if result is MISSING:
+            result = method(self, *args, **kwargs)
+            self._cache.put(key, result, ttl=self._ttl(result))
+        return result
+
+    return wrapper
 
 
 class ExperimentLoader:
     """Loads artifacts related to experiments."""
 
-    def __init__(self, mongo_uri=None, db_name="sacred", unpickle: bool = True, **mongo_client_kwargs):
+    def __init__(
+        self,
+        mongo_uri=None,
+        db_name="sacred",
+        unpickle: bool = True,
+        cache_dir: Optional[Union[Path, str]] = None,
+        cache_size: int = DEFAULT_PERSISTENT_CACHE_SIZE,
+        max_cache_entries: Optional[int] = MAX_CACHE_SIZE,
+        max_cache_bytes: Optional[int] = None,
+        running_ttl: Optional[float] = DEFAULT_RUNNING_TTL,
+        artifact_cache_dir: Optional[Union[Path, str]] = None,
+        artifact_cache_size: int = DEFAULT_ARTIFACT_CACHE_SIZE,
+        **mongo_client_kwargs,
+    ):
+        """
+        Args:
+            mongo_uri: The uri of the mongo server.
+            db_name: The name of the database sacred writes to.
+            unpickle: Whether to restore objects that sacred stored in the info dict.
+            cache_dir: Directory of a persistent cache that keeps the documents and metrics of finished runs
+                       across sessions. Disabled by default.
+            cache_size: The maximum size of the persistent cache in bytes.
+            max_cache_entries: The maximum number of results kept in memory by the find methods.
+            max_cache_bytes: The maximum estimated size of the results kept in memory by the find methods.
+            running_ttl: Seconds after which results that contain unfinished runs are retrieved again.
+                         None to keep them until the cache is cleared.
+            artifact_cache_dir: Directory of a cache that keeps downloaded artifacts across sessions, so that
+                                their content is only downloaded once. Disabled by default.
+            artifact_cache_size: The maximum size of the artifact cache in bytes.
+            mongo_client_kwargs: Additional arguments for the mongo client.
+        """
         client: MongoClient = MongoClient(mongo_uri, **mongo_client_kwargs)
         self._database = client[db_name]
         self._runs = self._database.runs
@@ -29,24 +92,53 @@ class ExperimentLoader:
 
             importlib.reload(sacred.serializer)
         self._unpickle = unpickle
+        self._cache = ResultCache(max_entries=max_cache_entries, max_bytes=max_cache_bytes, sizeof=_sizeof)
+        self._running_ttl = running_ttl
+        self._last_sync = datetime.utcnow()
+        self._persistent_cache = None
+        if cache_dir is not None:
+            self._persistent_cache = PersistentCache(cache_dir, max_size=cache_size)
+            self._cache_key = _make_cache_key(mongo_uri, db_name)
+        self._artifact_cache = None
+        if artifact_cache_dir is not None:
+            self._artifact_cache = ArtifactCache(artifact_cache_dir, max_size=artifact_cache_size)
 
     def find_by_ids(self, experiment_ids: Iterable[int]) -> QuerySet:
         """
         Find experiments based on a collection of ids.
 
+        All experiments that were not retrieved before are fetched with as few
+        queries as possible.
+
         Args:
             experiment_ids: Iterable of experiment ids.
 
         Returns:
-            The experiments corresponding to the ids.
+            The experiments corresponding to the ids, in the order of the given ids.
         """
-        experiments = [self.find_by_id(experiment_id) for experiment_id in experiment_ids]
-
-        return QuerySet(experiments)
+        experiment_ids = list(experiment_ids)
+        unique_ids = list(dict.fromkeys(experiment_ids))
+        experiments = {}
+        for experiment_id in unique_ids:
+            experiment = self._cache.get(("find_by_id", experiment_id))
+            if experiment is not MISSING:
+                experiments[experiment_id] = experiment
+        for run in self._fetch_runs(
+            [experiment_id for experiment_id in unique_ids if experiment_id not in experiments]
+        ):
+            experiment = self._make_experiment(run)
+            self._cache.put(("find_by_id", experiment.id), experiment, ttl=self._ttl(experiment))
+            experiments[experiment.id] = experiment
+
+        not_found = [experiment_id for experiment_id in unique_ids if experiment_id not in experiments]
+        if not_found:
+            raise ValueError(f'Experiments with ids {not_found} do not exist in database "{self._database.name}".')
+
+        return QuerySet([experiments[experiment_id] for experiment_id in experiment_ids])
 
     # The cache makes sure that retrieval of the experiments
     # is not unnecessarily done more than once.
-    @lru_cache(maxsize=MAX_CACHE_SIZE)
+    @_cached
     def find_by_id(self, experiment_id: int) -> Experiment:
         """
         Find experiment based on its id.
@@ -61,73 +153,137 @@ class ExperimentLoader:
 
         return self._make_experiment(experiment)
 
-    @lru_cache(maxsize=MAX_CACHE_SIZE)
-    def find_by_name(self, name: str) -> QuerySet:
+    def find_by_name(
+        self,
+        name: str,
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        match: str = "regex",
+    ) -> QuerySet:
         """
-        Find experiments based on regex search against its name.
+        Find experiments based on search against its name.
 
-        A partial match between experiment name and regex is enough
+        By default, a partial match between experiment name and regex is enough
         to find the experiment.
 
         Args:
-            name: Regex that is matched against the experiment name.
+            name: Regex, string or words that are matched against the experiment name, depending on `match`.
+            fields: Top-level fields to retrieve from the database. Other fields are fetched on first access.
+            exclude: Top-level fields not to retrieve from the database. They are fetched on first access.
+            match: How the name is matched, see `find_by_key`.
 
         Returns:
             The matched experiments.
         """
-        return self.find_by_key("experiment.name", name)
-
-    @lru_cache(maxsize=MAX_CACHE_SIZE)
-    def find_by_config_key(self, key: str, value: Union[str, numbers.Real, tuple]) -> QuerySet:
+        return self.find_by_key("experiment.name", name, fields=fields, exclude=exclude, match=match)
+
+    def find_by_config_key(
+        self,
+        key: str,
+        value: Union[str, numbers.Real, tuple],
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        match: str = "regex",
+    ) -> QuerySet:
         """
         Find experiments based on search against a configuration value.
 
-        A partial match between configuration value and regex is enough
+        By default, a partial match between configuration value and regex is enough
         to find the experiment.
 
         Args:
             key: Configuration key to search on.
             value: Value that is matched against the experiment's configuration.
-                   Can be either a string which is  then interpreted as a regex or a number.
+                   Can be either a string which is matched as given by `match` or a number.
+            fields: Top-level fields to retrieve from the database. Other fields are fetched on first access.
+            exclude: Top-level fields not to retrieve from the database. They are fetched on first access.
+            match: {"regex", "exact", "prefix"} How a string value is matched, see `find_by_key`.
 
         Returns:
             The matched experiments.
         """
-        key = f"config.{key}"
-        cursor = self._search_collection(key, value)
-        return self._read_from_cursor(cursor)
-
-    @lru_cache(maxsize=MAX_CACHE_SIZE)
-    def find_by_key(self, key: str, value: Union[str, numbers.Real]) -> QuerySet:
+        return self._find_by_config_key(key, value, _make_projection(fields, exclude), match)
+
+    @_cached
+    def _find_by_config_key(
+        self, key: str, value: Union[str, numbers.Real, tuple], projection: Optional[ProjectionT], match: str
+    ) -> QuerySet:
+        query = _make_search_query(f"config.{key}", value, match)
+        return self._read_from_cursor(self._find_runs(query, projection), projection, query)
+
+    def find_by_key(
+        self,
+        key: str,
+        value: Union[str, numbers.Real],
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        match: str = "regex",
+    ) -> QuerySet:
         """
         Find experiments based on search against a value stored in the database.
 
-        A partial match between the value and the regex is enough
+        By default, a partial match between the value and the regex is enough
         to find the experiment.
 
         Args:
             key: Key to search on.
             value: Value that is matched against the experiment's information.
-                   Can be either a string which is  then interpreted as a regex or a number.
+                   Can be either a string which is matched as given by `match` or a number.
+            fields: Top-level fields to retrieve from the database. Other fields are fetched on first access.
+            exclude: Top-level fields not to retrieve from the database. They are fetched on first access.
+            match: {"regex", "exact", "prefix", "text"} How a string value is matched. "regex" finds values that
+                   contain a match of the regex, which cannot be served by an index. "exact" and "prefix" find values
+                   that are equal to or start with the string, case-sensitively, and can use an index on the key.
+                   "text" searches the words of the string with the text index on the experiment name, which
+                   `ensure_indexes` creates. It is only supported for the key "experiment.name".
 
         Returns:
             The matched experiments.
         """
-        cursor = self._search_collection(key, value)
-        return self._read_from_cursor(cursor)
-
-    @lru_cache(maxsize=MAX_CACHE_SIZE)
-    def find_all(self) -> QuerySet:
+        return self._find_by_key(key, value, _make_projection(fields, exclude), match)
+
+    @_cached
+    def _find_by_key(
+        self, key: str, value: Union[str, numbers.Real], projection: Optional[ProjectionT], match: str
+    ) -> QuerySet:
+        query = _make_search_query(key, value, match)
+        return self._read_from_cursor(self._find_runs(query, projection), projection, query)
+
+    def find_all(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+        batch_size: int = LAZY_BATCH_SIZE,
+    ) -> QuerySet:
         """
         Find all experiments stored in the database.
 
+        Args:
+            fields: Top-level fields to retrieve from the database. Other fields are fetched on first access.
+            exclude: Top-level fields not to retrieve from the database. They are fetched on first access.
+            lazy: Whether to return a `LazyQuerySet` that streams the experiments from the database
+                  instead of loading all of them at once. Lazy query sets are not cached.
+            batch_size: Number of run documents retrieved per round trip when iterating a lazy query set.
+
         Returns:
             All experiments.
         """
-        cursor = self._runs.find()
-        return QuerySet([self._make_experiment(experiment) for experiment in cursor])
-
-    def find_latest(self, n: int = 1, attr: str = "start_time") -> Union[Experiment, QuerySet]:
+        if lazy:
+            return self.find({}, fields=fields, exclude=exclude, lazy=True, batch_size=batch_size)
+        return self._find_all(_make_projection(fields, exclude))
+
+    @_cached
+    def _find_all(self, projection: Optional[ProjectionT]) -> QuerySet:
+        return self._read_from_cursor(self._find_runs({}, projection), projection, {})
+
+    def find_latest(
+        self,
+        n: int = 1,
+        attr: str = "start_time",
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+    ) -> Union[Experiment, QuerySet]:
         """Find the most recent experiments.
 
         Caching is disabled for this method.
@@ -135,76 +291,436 @@ class ExperimentLoader:
         Args:
             n: The number of latest experiments to retrieve.
             attr: The attribute to determine which experiments are the most recent ones.
+            fields: Top-level fields to retrieve from the database. Other fields are fetched on first access.
+            exclude: Top-level fields not to retrieve from the database. They are fetched on first access.
 
         Returns:
             Either the latest experiment or the set of latest experiments in case more than one were requested.
         """
-        cursor = self._runs.find().sort(attr, DESCENDING).limit(n)
-        experiments = [self._make_experiment(experiment) for experiment in cursor]
+        projection = _make_projection(fields, exclude)
+        runs = self._find_runs({}, projection, sort=[(attr, DESCENDING)], limit=n)
+        experiments = [self._make_experiment(experiment, projection) for experiment in runs]
         if len(experiments) == 1:
             return experiments[0]
         else:
             return QuerySet(experiments)
 
-    def find(self, query: dict) -> QuerySet:
+    def find(
+        self,
+        query: dict,
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+        batch_size: int = LAZY_BATCH_SIZE,
+    ) -> QuerySet:
         """Find experiments based on a mongo query.
 
         Args:
-            An arbitrary mongo query.
+            query: An arbitrary mongo query.
+            fields: Top-level fields to retrieve from the database. Other fields are fetched on first access.
+            exclude: Top-level fields not to retrieve from the database. They are fetched on first access.
+            lazy: Whether to return a `LazyQuerySet` that streams the experiments from the database
+                  instead of loading all of them at once.
+            batch_size: Number of run documents retrieved per round trip when iterating a lazy query set.
 
         Returns:
             The matched experiments.
         """
-        cursor = self._runs.find(query)
-        return self._read_from_cursor(cursor)
+        projection = _make_projection(fields, exclude)
+        if lazy:
+            return LazyQuerySet(
+                self._runs,
+                query,
+                partial(self._make_experiment, projection=projection),
+                projection=projection,
+                batch_size=batch_size,
+            )
+        return self._read_from_cursor(self._find_runs(query, projection), projection, query)
+
+    def project(
+        self,
+        query: dict,
+        on: List[Union[StrOrTupleT, Dict[StrOrTupleT, ReducerT]]],
+        rename: Optional[str] = "last",
+        on_missing: str = "raise",
+    ) -> pd.DataFrame:
+        """Project the experiments matching a query onto a dataframe, inside the database if possible.
+
+        If `on` only contains paths into the run documents, e.g. `config.*`, `result`, `status` or `start_time`,
+        and metrics reduced by the reducers in `incense.reducers`, the projection is evaluated by a single
+        aggregation and no experiments are created. Otherwise, this is the same as
+        `loader.find(query).project(on, rename, on_missing)`.
 
-    def _read_from_cursor(self, cursor) -> QuerySet:
-        experiments = [self._make_experiment(experiment) for experiment in cursor]
-        return QuerySet(experiments)
+        Args:
+            query: An arbitrary mongo query.
+            on: The paths to project, see `QuerySet.project`.
+            rename: The renaming strategy used to create the column names, see `QuerySet.project`.
+            on_missing: {"raise", "ignore"} Whether to raise an error when missing value is encountered or replace it
+                        with a missing value.
 
-    def cache_clear(self):
+        Returns:
+            A dataframe containing the projected values with the experiment id set as index.
+        """
+        query_set = QuerySet(query=query)
+        stratified_on = query_set._stratify_mapping(on)
+        rename_mapping = query_set._make_rename_mapping(stratified_on, rename)
+        pipeline = make_projection_pipeline(query, stratified_on)
+        if pipeline is None:
+            return self.find(query).project(on, rename=rename, on_missing=on_missing)
+        exp_ids, columns = read_projection(self._runs.aggregate(pipeline), stratified_on, on_missing)
+        return make_frame(exp_ids, columns, [rename_mapping[path] for path in stratified_on])
+
+    def _read_from_cursor(self, cursor, projection=None, query: Optional[dict] = None) -> QuerySet:
+        experiments = [self._make_experiment(experiment, projection) for experiment in cursor]
+        return QuerySet(experiments, query=query, projection=projection)
+
+    def ensure_indexes(self) -> List[str]:
+        """Create the indexes that the queries of incense rely on, unless they exist already.
+
+        These are indexes on the run id and name of metrics, and on the start, stop and heartbeat time,
+        the status and the experiment name of runs. Creating indexes on a large database takes a while and
+        requires write access.
+
+        Returns:
+            The names of the created indexes.
+        """
+        return indexes.ensure_indexes(self._database)
+
+    def explain(self, query: Union[dict, QuerySet]) -> indexes.QueryPlan:
+        """Explain how the database evaluates a query on the runs and suggest indexes if it scans all runs.
+
+        Args:
+            query: A mongo query, or a query set returned by one of the find methods, whose query is explained.
+
+        Returns:
+            The plan of the query.
+        """
+        if isinstance(query, QuerySet):
+            if query._query is None:
+                raise ValueError("The query set was not created from a query, e.g. by find_by_ids.")
+            query = query._query
+        return indexes.explain(self._runs, query)
+
+    def cache_clear(self, persistent: bool = False):
         """Clear all caches of all find functions.
 
-        Useful when you want to see the updates to your database."""
-        self.find_all.cache_clear()
-        self.find_by_key.cache_clear()
-        self.find_by_config_key.cache_clear()
-        self.find_by_id.cache_clear()
-        self.find_by_name.cache_clear()
+        To see the updates to your database, `refresh` is usually cheaper.
+
+        Args:
+            persistent: Whether to also remove the runs of this database from the persistent cache.
+        """
+        self._cache.clear()
+        if persistent and self._persistent_cache is not None:
+            self._persistent_cache.clear(self._cache_key)
+
+    def cache_info(self) -> CacheInfo:
+        """Report hits, misses, evictions and size of the cache of the find methods."""
+        return self._cache.info()
+
+    def refresh(self) -> QuerySet:
+        """Bring the cached results of the find methods up to date with the database.
+
+        Instead of clearing the cache, the ids of cached runs whose heartbeat, start or stop time is newer than
+        the last refresh are looked up, as are those of new runs that match the query of a cached query set.
+        Only these runs are retrieved, with the projection their cached results were retrieved with. The cached
+        experiments of these runs are updated in place, and cached query sets gain or lose the runs that now
+        (no longer) match the query they were created from.
+
+        Returns:
+            The experiments that were updated or added to a cached query set.
+        """
+        sync_time = datetime.utcnow()
+        entries = self._cache.items()
+        cached: Dict[Any, List[Experiment]] = defaultdict(list)
+        for _, result in entries:
+            for experiment in [result] if isinstance(result, Experiment) else result:
+                if not any(experiment is other for other in cached[experiment.id]):
+                    cached[experiment.id].append(experiment)
+        if not cached:
+            self._last_sync = sync_time
+            return QuerySet()
+
+        changed_query = self._changed_since(self._last_sync)
+        changed_ids: Set[Any] = set()
+        for run_ids in _batched(cached, FIND_BY_IDS_BATCH_SIZE):
+            query = {"$and": [changed_query, {"_id": {"$in": run_ids}}]}
+            changed_ids.update(run["_id"] for run in self._runs.find(query, {"_id": 1}))
+
+        # Runs that were changed or added since the last refresh and match the query of a cached query set.
+        conditions = list(changed_query["$or"])
+        known_ids = [run_id for run_id in cached if isinstance(run_id, numbers.Integral)]
+        if known_ids:
+            conditions.append({"_id": {"$gt": max(known_ids)}})
+        matching: Dict[int, List[Any]] = {}
+        for i, (_, result) in enumerate(entries):
+            if isinstance(result, QuerySet) and result._query is not None:
+                query = {"$and": [result._query, {"$or": conditions}]}
+                matching[i] = [run["_id"] for run in self._runs.find(query, {"_id": 1}, sort=[("_id", ASCENDING)])]
+                changed_ids.update(matching[i])
+
+        # The changed runs are retrieved with the projections of the experiments and query sets that hold them.
+        wanted: Dict[Optional[ProjectionT], Set[Any]] = defaultdict(set)
+        for run_id in changed_ids:
+            for experiment in cached.get(run_id, []):
+                wanted[experiment._projection].add(run_id)
+        for i, (_, result) in enumerate(entries):
+            if i in matching:
+                wanted[result._projection].update(matching[i])
+        changed: Dict[Optional[ProjectionT], Dict[Any, dict]] = {}
+        for projection, wanted_ids in wanted.items():
+            changed[projection] = {}
+            for run_ids in _batched(wanted_ids, FIND_BY_IDS_BATCH_SIZE):
+                runs = self._runs.find({"_id": {"$in": run_ids}}, _as_mongo_projection(projection))
+                changed[projection].update((run["_id"], run) for run in runs)
+        if self._persistent_cache is not None:
+            for run in changed.get(None, {}).values():
+                self._persistent_cache.put_run(self._cache_key, run)
+
+        updated: Dict[Any, Experiment] = {}
+        for run_id in changed_ids:
+            for experiment in cached.get(run_id, []):
+                runs = changed[experiment._projection]
+                if run_id in runs:
+                    experiment._update(runs[run_id])
+                    updated[run_id] = experiment
+
+        for i, (key, result) in enumerate(entries):
+            if isinstance(result, Experiment):
+                touched = result.id in changed_ids
+            elif i in matching and changed_ids:
+                touched = self._patch_query_set(result, matching[i], changed_ids, changed, cached, updated)
+            else:
+                touched = False
+            if touched:
+                self._cache.put(key, result, ttl=self._ttl(result))
+
+        self._last_sync = sync_time
+        return QuerySet(list(updated.values()))
+
+    def watch(
+        self,
+        query: Optional[dict] = None,
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None,
+        change_streams: Optional[bool] = None,
+    ) -> Watcher:
+        """Follow the runs that match a query and the metrics they log.
+
+        Iterating the returned watcher yields an `ExperimentUpdate` whenever a run document changes
+        and a `MetricUpdate` with the new points whenever a metric grows. Change streams are used if the
+        database supports them, which requires a replica set. Otherwise the runs are polled for newer heartbeats.
+
+        Args:
+            query: A mongo query selecting the runs to watch. All runs if None.
+            poll_interval: Seconds to wait for changes before checking again.
+            timeout: Seconds after which iteration stops. Iterate forever if None.
+            change_streams: Whether to use change streams. If None, they are used if the database supports them.
+
+        Returns:
+            A watcher that can be iterated or polled for updates.
+        """
+        return Watcher(
+            self,
+            {} if query is None else query,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            change_streams=change_streams,
+        )
+
+    def _changed_since(self, last_sync: datetime) -> dict:
+        """Build a query for runs whose heartbeat, start or stop time is newer than a previous sync."""
+        since = last_sync - CLOCK_SKEW_TOLERANCE
+        return {"$or": [{field: {"$gt": since}} for field in ("heartbeat", "start_time", "stop_time")]}
+
+    def _patch_query_set(
+        self,
+        query_set: QuerySet,
+        matching: List[Any],
+        changed_ids: Set[Any],
+        changed: Dict[Optional[ProjectionT], Dict[Any, dict]],
+        cached: Dict[Any, List[Experiment]],
+        updated: Dict[Any, Experiment],
+    ) -> bool:
+        """Add and remove changed runs, depending on whether they are among the changed runs matching the query."""
+        contained = {experiment.id for experiment in query_set}
+        matching_ids = set(matching)
+        experiments = [
+            experiment for experiment in query_set if experiment.id not in changed_ids or experiment.id in matching_ids
+        ]
+        runs = changed[query_set._projection]
+        for run_id in matching:
+            if run_id in contained or run_id not in runs:
+                continue
+            # Experiments of the same run and projection are shared between cached results.
+            experiment = next(
+                (experiment for experiment in cached[run_id] if experiment._projection == query_set._projection), None
+            )
+            if experiment is None:
+                experiment = self._make_experiment(runs[run_id], query_set._projection)
+                cached[run_id].append(experiment)
+            updated.setdefault(run_id, experiment)
+            experiments.append(experiment)
+        touched = len(experiments) != len(query_set) or bool(contained & changed_ids)
+        query_set.data = experiments
+        return touched
+
+    def _ttl(self, result: Union[Experiment, QuerySet]) -> Optional[float]:
+        experiments = [result] if isinstance(result, Experiment) else result
+        if all(is_final(experiment._document) for experiment in experiments):
+            return None
+        return self._running_ttl
+
+    def _find_runs(self, query: dict, projection: Optional[ProjectionT] = None, sort=None, limit: int = 0):
+        """Find run documents, taking complete documents from the persistent cache where possible."""
+        if self._persistent_cache is None or projection is not None:
+            return self._runs.find(query, _as_mongo_projection(projection), sort=sort, limit=limit)
+        run_ids = [run["_id"] for run in self._runs.find(query, {"_id": 1}, sort=sort, limit=limit)]
+        runs = {run["_id"]: run for run in self._fetch_runs(run_ids)}
+        return [runs[run_id] for run_id in run_ids if run_id in runs]
+
+    def _fetch_runs(self, run_ids: List[int]) -> Iterator[dict]:
+        """Retrieve the complete run documents for some ids, in no particular order."""
+        if self._persistent_cache is not None:
+            cached = self._persistent_cache.get_runs(self._cache_key, run_ids)
+            yield from cached.values()
+            run_ids = [run_id for run_id in run_ids if run_id not in cached]
+        for start in range(0, len(run_ids), FIND_BY_IDS_BATCH_SIZE):
+            batch = run_ids[start : start + FIND_BY_IDS_BATCH_SIZE]
+            for run in self._runs.find({"_id": {"$in": batch}}):
+                if self._persistent_cache is not None:
+                    self._persistent_cache.put_run(self._cache_key, run)
+                yield run
+
+    def _find_metrics(
+        self, experiments: Dict[int, Experiment], names: Optional[Collection[str]] = None
+    ) -> Iterator[dict]:
+        """Retrieve the metric documents of some experiments, optionally only those with the given names."""
+        run_ids = list(experiments)
+        finished_ids = []
+        if self._persistent_cache is not None:
+            cached = self._persistent_cache.get_metrics(self._cache_key, run_ids)
+            for metric_db_entries in cached.values():
+                yield from _filter_metrics(metric_db_entries, names)
+            run_ids = [run_id for run_id in run_ids if run_id not in cached]
+            finished_ids = [run_id for run_id in run_ids if is_final(experiments[run_id]._document)]
+
+        if self._persistent_cache is not None and finished_ids:
+            # All metrics of finished runs are retrieved, so that they can be cached.
+            metric_db_entries_by_run = defaultdict(list)
+            for metric_db_entry in self._database.metrics.find({"run_id": {"$in": finished_ids}}):
+                metric_db_entries_by_run[metric_db_entry["run_id"]].append(metric_db_entry)
+            for run_id in finished_ids:
+                self._persistent_cache.put_metrics(self._cache_key, run_id, metric_db_entries_by_run[run_id])
+                yield from _filter_metrics(metric_db_entries_by_run[run_id], names)
+
+        unfinished_ids = [run_id for run_id in run_ids if run_id not in set(finished_ids)]
+        if unfinished_ids:
+            query: Dict[str, Any] = {"run_id": {"$in": unfinished_ids}}
+            if names is not None:
+                query["name"] = {"$in": list(names)}
+            yield from self._database.metrics.find(query)
+
+    def _discard(self, experiment_id: int):
+        """Remove a deleted experiment from all cached results."""
+        for key, result in self._cache.items():
+            if isinstance(result, Experiment):
+                if result.id == experiment_id:
+                    self._cache.discard(key)
+            elif any(experiment.id == experiment_id for experiment in result):
+                result.data = [experiment for experiment in result if experiment.id != experiment_id]
+        if self._persistent_cache is not None:
+            self._persistent_cache.discard(self._cache_key, experiment_id)
 
     def _find_experiment(self, experiment_id: int):
-        run = self._runs.find_one({"_id": experiment_id})
+        run = next(self._fetch_runs([experiment_id]), None)
         if run is None:
             raise ValueError(f'Experiment with id {experiment_id} does not exist in database "{self._database.name}".')
         return run
 
-    def _make_experiment(self, experiment) -> Experiment:
+    def _make_experiment(self, experiment, projection=None) -> Experiment:
         return Experiment.from_db_object(
-            self._database, self._grid_filesystem, experiment, loader=self, unpickle=self._unpickle
+            self._database,
+            self._grid_filesystem,
+            experiment,
+            loader=self,
+            unpickle=self._unpickle,
+            projection=projection,
         )
 
-    def _search_collection(self, key, value):
-        if isinstance(value, str):
-            cursor = self._runs.find({key: {"$regex": rf"{value}"}})
-        elif isinstance(value, numbers.Real):
-            cursor = self._runs.find({key: value})
-        else:
-            raise ValueError(f"Search value should be either string or number, but was {value}")
-        return cursor
+
+def _make_search_query(key: str, value, match: str = "regex") -> dict:
+    if match not in MATCH_MODES:
+        raise ValueError(f"match can be one of {list(MATCH_MODES)}, but was {match}.")
+    if isinstance(value, str):
+        if match == "exact":
+            return {key: value}
+        elif match == "prefix":
+            return {key: {"$regex": f"^{re.escape(value)}"}}
+        elif match == "text":
+            if key != indexes.TEXT_INDEXED_KEY:
+                raise ValueError(
+                    f'match="text" is only supported for "{indexes.TEXT_INDEXED_KEY}", but the key was "{key}".'
+                )
+            return {"$text": {"$search": value}}
+        return {key: {"$regex": rf"{value}"}}
+    elif isinstance(value, numbers.Real):
+        return {key: value}
+    else:
+        raise ValueError(f"Search value should be either string or number, but was {value}")
+
+
+def _sizeof(result: Union[Experiment, QuerySet]) -> int:
+    experiments = [result] if isinstance(result, Experiment) else result
+    return sum(experiment._size() for experiment in experiments)
+
+
+def _make_cache_key(mongo_uri: Optional[str], db_name: str) -> str:
+    """Identify a database by its hosts and name, leaving out credentials."""
+    if mongo_uri is None:
+        hosts = ["localhost:27017"]
+    else:
+        hosts = sorted(f"{host}:{port}" for host, port in uri_parser.parse_uri(mongo_uri)["nodelist"])
+    return f"{','.join(hosts)}/{db_name}"
+
+
+def _filter_metrics(metric_db_entries: Iterable[dict], names: Optional[Collection[str]]) -> Iterator[dict]:
+    return (entry for entry in metric_db_entries if names is None or entry["name"] in names)
+
+
+def _make_projection(fields: Optional[Iterable[str]], exclude: Optional[Iterable[str]]) -> Optional[ProjectionT]:
+    """Turn the `fields` and `exclude` arguments of the find methods into a hashable projection."""
+    if fields is not None and exclude is not None:
+        raise ValueError("Only one of fields and exclude can be given.")
+    fields = None if fields is None else list(fields)
+    exclude = None if exclude is None else list(exclude)
+    dotted = [field for field in [*(fields or []), *(exclude or [])] if "." in field]
+    if dotted:
+        raise ValueError(f"Only top-level fields can be given, but got {dotted}.")
+    if fields is not None:
+        # Fields that are needed to display and delete experiments are always included.
+        return tuple((field, 1) for field in sorted({*fields, *ALWAYS_INCLUDED_FIELDS}))
+    if exclude is not None:
+        return tuple((field, 0) for field in sorted(set(exclude)))
+    return None
+
+
+def _as_mongo_projection(projection: Optional[ProjectionT]) -> Optional[Dict[str, int]]:
+    return None if projection is None else dict(projection)
 
 
 class FileSystemExperimentLoader:
     """Loads artifacts related to experiments."""
 
-    def __init__(self, runs_dir: Union[Path, str]):
+    def __init__(self, runs_dir: Union[Path, str], max_cache_entries: Optional[int] = MAX_CACHE_SIZE):
         self._runs_dir = Path(runs_dir)
+        self._cache = ResultCache(max_entries=max_cache_entries)
 
     def __repr__(self):
         return f'{self.__class__.__name__}("{self._runs_dir}")'
 
     # The cache makes sure that retrieval of the experiments
     # is not unnecessarily done more than once.
-    @lru_cache(maxsize=MAX_CACHE_SIZE)
+    @_cached
     def find_by_id(self, experiment_id: int) -> FileSystemExperiment:
         """
         Find experiment based on its id.
@@ -223,3 +739,14 @@ class FileSystemExperimentLoader:
             )
         else:
             return FileSystemExperiment.from_run_dir(run_dir)
+
+    def cache_info(self) -> CacheInfo:
+        """Report hits, misses, evictions and size of the cache of the find methods."""
+        return self._cache.info()
+
+    def cache_clear(self):
+        """Clear the cache of the find methods."""
+        self._cache.clear()
+
+    def _ttl(self, result: FileSystemExperiment) -> Optional[float]:
+        return None
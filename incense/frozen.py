@@ -0,0 +1,117 @@
+from collections.abc import Mapping, Sequence
+from copy import deepcopy
+from typing import *
+
+
+class FrozenDict(Mapping):
+    """Read-only view of a dict that also allows dotted access to its keys.
+
+    Nested dicts and lists are only wrapped when they are accessed, so wrapping
+    a run document does not copy it.
+    """
+
+    __slots__ = ("_data",)
+    _data: dict
+
+    def __init__(self, data: dict):
+        object.__setattr__(self, "_data", data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._data!r})"
+
+    def __getitem__(self, key):
+        return freeze(self._data[key])
+
+    def __getattr__(self, item):
+        if item == "_data" or item.startswith("__"):
+            raise AttributeError(item)
+        try:
+            return self[item]
+        except KeyError:
+            raise AttributeError(f"{self.__class__.__name__} has no attribute '{item}'") from None
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __delattr__(self, item):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __hash__(self):
+        return hash(_hashable(self._data))
+
+    def __reduce__(self):
+        return self.__class__, (self._data,)
+
+
+class FrozenList(Sequence):
+    """Read-only view of a list, which wraps nested dicts and lists when they are accessed."""
+
+    __slots__ = ("_data",)
+    _data: list
+
+    def __init__(self, data: list):
+        object.__setattr__(self, "_data", data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._data!r})"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__class__(self._data[index])
+        return freeze(self._data[index])
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __delattr__(self, item):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenList):
+            return self._data == other._data
+        if isinstance(other, (list, tuple)):
+            return self._data == list(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(_hashable(self._data))
+
+    def __reduce__(self):
+        return self.__class__, (self._data,)
+
+
+def freeze(obj: Any) -> Any:
+    """Wrap dicts and lists into read-only views. Other objects are returned as they are."""
+    if isinstance(obj, dict):
+        return FrozenDict(obj)
+    if isinstance(obj, list):
+        return FrozenList(obj)
+    return obj
+
+
+def _hashable(obj: Any) -> Any:
+    """Turn nested dicts and lists into frozensets and tuples, so that equal views hash equally."""
+    if isinstance(obj, dict):
+        return frozenset((key, _hashable(value)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return tuple(_hashable(value) for value in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Return a mutable deep copy of the data behind a read-only view."""
+    if isinstance(obj, (FrozenDict, FrozenList)):
+        return deepcopy(obj._data)
+    return obj
@@ -0,0 +1,111 @@
+from typing import *
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+
+# The field of the runs served by the text index, as a collection can only have one text index.
+TEXT_INDEXED_KEY = "experiment.name"
+# The indexes that back the queries incense issues itself, as pairs of collection and index keys.
+INDEXES = (
+    ("metrics", (("run_id", ASCENDING), ("name", ASCENDING))),
+    ("runs", (("start_time", DESCENDING),)),
+    ("runs", (("stop_time", DESCENDING),)),
+    ("runs", (("heartbeat", DESCENDING),)),
+    ("runs", (("status", ASCENDING),)),
+    ("runs", (("experiment.name", ASCENDING),)),
+    # Serves `match="text"` of the find methods.
+    ("runs", ((TEXT_INDEXED_KEY, TEXT),)),
+)
+
+
+class QueryPlan(NamedTuple):
+    """The plan the database chose for a query on the runs collection.
+
+    Attributes:
+        query: The explained query.
+        stages: The stages of the winning plan, e.g. "IXSCAN" or "COLLSCAN".
+        indexes: The names of the indexes used by the winning plan.
+        suggested_indexes: Fields that could be indexed if the query scans the whole collection.
+    """
+
+    query: dict
+    stages: List[str]
+    indexes: List[str]
+    suggested_indexes: List[str]
+
+    @property
+    def collscan(self) -> bool:
+        """Whether the query scans the whole collection."""
+        return "COLLSCAN" in self.stages
+
+
+def ensure_indexes(database) -> List[str]:
+    """Create the indexes in `INDEXES` that do not exist yet.
+
+    Indexes with the same keys but another name, e.g. created by sacred or by hand, are kept as they are.
+    The text index is only created if the runs collection does not have a text index yet.
+
+    Args:
+        database: The database sacred writes to.
+
+    Returns:
+        The names of the created indexes.
+    """
+    created = []
+    for collection, keys in INDEXES:
+        existing = {tuple(index["key"]) for index in database[collection].index_information().values()}
+        if keys in existing or (_is_text_index(keys) and any(map(_is_text_index, existing))):
+            continue
+        created.append(database[collection].create_index(list(keys)))
+    return created
+
+
+def explain(runs, query: dict) -> QueryPlan:
+    """Explain a query on the runs collection and suggest indexes if it scans the whole collection.
+
+    Args:
+        runs: The runs collection.
+        query: A mongo query.
+
+    Returns:
+        The plan of the query.
+    """
+    explanation = runs.find(query).explain()
+    stages: List[str] = []
+    indexes: List[str] = []
+    _collect_stages(explanation.get("queryPlanner", explanation), stages, indexes)
+    suggested = _query_fields(query) if "COLLSCAN" in stages else []
+    return QueryPlan(query, stages, indexes, suggested)
+
+
+def _is_text_index(keys: Iterable[Tuple[str, Any]]) -> bool:
+    # Existing text indexes are keyed by the internal "_fts" field.
+    return any(direction == TEXT for _, direction in keys)
+
+
+def _collect_stages(plan: Any, stages: List[str], indexes: List[str]) -> None:
+    """Walk the winning plan, which is nested differently for sharded clusters and different server versions."""
+    if isinstance(plan, dict):
+        for key, value in plan.items():
+            if key == "rejectedPlans":
+                continue
+            if key == "stage":
+                stages.append(value)
+            elif key == "indexName" and value not in indexes:
+                indexes.append(value)
+            else:
+                _collect_stages(value, stages, indexes)
+    elif isinstance(plan, list):
+        for item in plan:
+            _collect_stages(item, stages, indexes)
+
+
+def _query_fields(query: dict) -> List[str]:
+    """Find the fields a query filters on, including those inside of `$and`, `$or` and `$nor`."""
+    fields: List[str] = []
+    for key, value in query.items():
+        if key in ("$and", "$or", "$nor"):
+            for clause in value:
+                fields.extend(field for field in _query_fields(clause) if field not in fields)
+        elif not key.startswith("$") and key != "_id" and key not in fields:
+            fields.append(key)
+    return fields
@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import *
+
+import bson
+
+# Runs with one of these statuses will not change anymore and can safely be cached.
+FINAL_STATUSES = frozenset({"COMPLETED", "FAILED", "INTERRUPTED"})
+DEFAULT_PERSISTENT_CACHE_SIZE = 2**30
+
+RUN = "run"
+METRICS = "metrics"
+
+
+def is_final(run: Mapping) -> bool:
+    return run.get("status") in FINAL_STATUSES
+
+
+class PersistentCache:
+    """Stores run documents and metrics of finished runs in a SQLite database on disk.
+
+    Entries are keyed by database and run id. Once the total size of the cached documents
+    exceeds `max_size` bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Union[Path, str], max_size: int = DEFAULT_PERSISTENT_CACHE_SIZE):
+        cache_dir = Path(cache_dir).expanduser()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "runs.sqlite"
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    database TEXT NOT NULL,
+                    run_id NOT NULL,
+                    kind TEXT NOT NULL,
+                    document BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (database, run_id, kind)
+                )
+                """
+            )
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}("{self.path}")'
+
+    @property
+    def size(self) -> int:
+        """The total size of all cached documents in bytes."""
+        with self._lock:
+            (size,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return size
+
+    def get_runs(self, database: str, run_ids: Iterable[Any]) -> Dict[Any, dict]:
+        """Retrieve the cached run documents for some run ids. Run ids that are not cached are left out."""
+        return self._get(database, run_ids, RUN)
+
+    def put_run(self, database: str, run: dict) -> None:
+        """Cache a run document, if the run has finished."""
+        if is_final(run):
+            self._put(database, run["_id"], RUN, run)
+
+    def get_metrics(self, database: str, run_ids: Iterable[Any]) -> Dict[Any, List[dict]]:
+        """Retrieve the cached metric documents for some run ids. Run ids that are not cached are left out."""
+        return {run_id: document["metrics"] for run_id, document in self._get(database, run_ids, METRICS).items()}
+
+    def put_metrics(self, database: str, run_id: Any, metrics: List[dict]) -> None:
+        """Cache all metric documents of a finished run."""
+        self._put(database, run_id, METRICS, {"metrics": metrics})
+
+    def discard(self, database: str, run_id: Any) -> None:
+        """Remove everything cached for a run."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries WHERE database = ? AND run_id = ?", (database, run_id))
+
+    def clear(self, database: Optional[str] = None) -> None:
+        """Remove all entries, or only those of a single database."""
+        with self._lock:
+            with self._connection:
+                if database is None:
+                    self._connection.execute("DELETE FROM entries")
+                else:
+                    self._connection.execute("DELETE FROM entries WHERE database = ?", (database,))
+            self._connection.execute("VACUUM")
+
+    def _get(self, database: str, run_ids: Iterable[Any], kind: str) -> Dict[Any, dict]:
+        run_ids = list(run_ids)
+        documents = {}
+        with self._lock, self._connection:
+            # Stay below SQLite's limit on the number of query parameters.
+            for start in range(0, len(run_ids), 500):
+                batch = run_ids[start : start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT run_id, document FROM entries WHERE database = ? AND kind = ? AND run_id IN ({placeholders})",
+                    (database, kind, *batch),
+                ).fetchall()
+                for run_id, document in rows:
+                    documents[run_id] = bson.decode(document)
+                self._connection.execute(
+                    f"UPDATE entries SET last_access = ? WHERE database = ? AND kind = ? AND run_id IN ({placeholders})",
+                    (time.time(), database, kind, *batch),
+                )
+        return documents
+
+    def _put(self, database: str, run_id: Any, kind: str, document: dict) -> None:
+        encoded = bson.encode(document)
+        if len(encoded) > self.max_size:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (database, run_id, kind, encoded, len(encoded), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (size,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if size <= self.max_size:
+            return
+        evicted = []
+        for database, run_id, kind, entry_size in self._connection.execute(
+            "SELECT database, run_id, kind, size FROM entries ORDER BY last_access"
+        ):
+            evicted.append((database, run_id, kind))
+            size -= entry_size
+            if size <= self.max_size:
+                break
+        self._connection.executemany("DELETE FROM entries WHERE database = ? AND run_id = ? AND kind = ?", evicted)
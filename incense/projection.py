@@ -0,0 +1,161 @@
+from typing import *
+
+import pandas as pd
+
+from .experiment import Experiment
+from .frozen import FrozenDict, freeze
+from .reducers import MetricReducer
+
+AccessorT = Callable[[Any], Any]
+
+
+def compile_path(path: Tuple[str, ...], fallback: AccessorT) -> AccessorT:
+    """Compile a path of `QuerySet.project` into a function that extracts its value from an experiment.
+
+    The value is looked up in the raw run document, or in the metrics loaded into the experiment,
+    with plain dict access. Whenever that could give a different result than trying `getattr` and
+    `__getitem__` on every step, the lookup is left to `fallback`: for paths that name attributes of
+    experiments or of dicts, for missing values, for values that are not dicts and for objects that
+    are not experiments.
+
+    Args:
+        path: The path to compile.
+        fallback: Extracts the value of the path from any object where the compiled lookup does not apply.
+
+    Returns:
+        A function that takes an experiment and returns the value of the path.
+    """
+    if path[0] == "metrics":
+        if len(path) == 2 and not hasattr(dict, path[1]):
+            return _compile_metric(path[1], fallback)
+        return fallback
+    if not is_document_path(path):
+        return fallback
+    return _compile_document_path(path, fallback)
+
+
+def make_projection_pipeline(query: dict, on: Dict[Tuple[str, ...], Any]) -> Optional[List[dict]]:
+    """Translate a projection into a single aggregation on the runs collection.
+
+    Values of the run documents are projected directly. Metrics reduced by a `MetricReducer`
+    are reduced in a `$lookup` on the metrics collection, so that only the reduced values are transferred.
+
+    Args:
+        query: The mongo query selecting the runs.
+        on: The paths of the projection, mapped to their reducers.
+
+    Returns:
+        The pipeline, or None if the projection contains paths or reducers that can only be evaluated on experiments.
+    """
+    values: Dict[str, str] = {}
+    metric_names = set()
+    reducers = {}
+    for i, (path, reducer) in enumerate(on.items()):
+        if _is_metric_reduction(path, reducer):
+            metric_names.add(path[1])
+            reducers[reducer.__name__] = reducer
+        elif not callable(reducer) and is_document_path(path) and all(_is_field_name(key) for key in path):
+            values[str(i)] = "$" + ".".join(path)
+        else:
+            return None
+
+    projection: Dict[str, Any] = {"_id": 1}
+    if values:
+        projection["values"] = values
+    pipeline: List[Dict[str, Any]] = [{"$match": query}, {"$project": projection}]
+    if metric_names:
+        metrics_pipeline = [
+            {"$match": {"$expr": {"$eq": ["$run_id", "$$run_id"]}, "name": {"$in": sorted(metric_names)}}},
+            {"$project": {"_id": 0, "name": 1, **{name: reducer.expression for name, reducer in reducers.items()}}},
+        ]
+        pipeline.append(
+            {"$lookup": {"from": "metrics", "let": {"run_id": "$_id"}, "pipeline": metrics_pipeline, "as": "metrics"}}
+        )
+    return pipeline
+
+
+def read_projection(
+    runs: Iterable[dict], on: Dict[Tuple[str, ...], Any], on_missing: str
+) -> Tuple[List[Any], List[List[Any]]]:
+    """Collect the result of a pipeline made by `make_projection_pipeline` into columns.
+
+    Args:
+        runs: The documents returned by the pipeline.
+        on: The paths of the projection, mapped to their reducers.
+        on_missing: {"raise", "ignore"} Whether to raise an error when missing value is encountered or replace it with
+                    a missing value.
+
+    Returns:
+        The experiment ids and a column of values for every path.
+    """
+    exp_ids: List[Any] = []
+    columns: List[List[Any]] = [[] for _ in on]
+    for run in runs:
+        exp_ids.append(run["_id"])
+        values = run.get("values", {})
+        metrics = {metric["name"]: metric for metric in run.get("metrics", [])}
+        for i, (column, (path, reducer)) in enumerate(zip(columns, on.items())):
+            if _is_metric_reduction(path, reducer):
+                if path[1] in metrics:
+                    column.append(metrics[path[1]].get(reducer.__name__))
+                    continue
+                missing = path[1]
+            elif str(i) in values:
+                value = values[str(i)]
+                column.append(freeze(value) if isinstance(value, (dict, list)) else value)
+                continue
+            else:
+                missing = ".".join(path)
+            if on_missing != "ignore":
+                raise KeyError(missing)
+            column.append(None)
+    return exp_ids, columns
+
+
+def make_frame(exp_ids: List[Any], columns: List[List[Any]], names: List[str]) -> pd.DataFrame:
+    """Create the dataframe of a projection, which may contain duplicate column names."""
+    projected = pd.DataFrame(dict(enumerate(columns)), index=pd.Index(exp_ids, name="exp_id"))
+    projected.columns = names
+    return projected
+
+
+def is_document_path(path: Tuple[str, ...]) -> bool:
+    """Whether a path names a field of the run document that is not shadowed by an attribute."""
+    if path[0] == "id" or path[0].startswith("_") or hasattr(Experiment, path[0]):
+        return False
+    return not any(hasattr(FrozenDict, key) for key in path[1:])
+
+
+def _is_field_name(key: str) -> bool:
+    return bool(key) and "." not in key and not key.startswith("$")
+
+
+def _is_metric_reduction(path: Tuple[str, ...], reducer) -> bool:
+    return isinstance(reducer, MetricReducer) and len(path) == 2 and path[0] == "metrics"
+
+
+def _compile_metric(name: str, fallback: AccessorT) -> AccessorT:
+    def get_metric(exp):
+        if isinstance(exp, Experiment):
+            metric = exp._metrics.get(name)
+            if metric is not None:
+                return metric
+        return fallback(exp)
+
+    return get_metric
+
+
+def _compile_document_path(path: Tuple[str, ...], fallback: AccessorT) -> AccessorT:
+    def get_value(exp):
+        if isinstance(exp, Experiment):
+            value = exp._document
+            try:
+                for key in path:
+                    value = value[key]
+            except (KeyError, TypeError, IndexError):
+                # Missing fields of partial experiments are retrieved and errors are raised by the fallback.
+                return fallback(exp)
+            return freeze(value) if isinstance(value, (dict, list)) else value
+        return fallback(exp)
+
+    return get_value
@@ -1,24 +1,78 @@
+import os
 from collections import OrderedDict, UserList, defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 from copy import copy
 from fnmatch import fnmatch
-from functools import reduce
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from functools import partial, reduce
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
+from gridfs import GridOut
 
-from .experiment import Experiment
+from .artifact import Artifact, ArrowArtifact, CSVArtifact, ParquetArtifact, _import_pyarrow
+from .experiment import Experiment, ProjectionT, make_artifact, metric_db_entry_to_series
+from .projection import compile_path, is_document_path, make_frame
+from .reducers import MetricReducer, aggregate_metrics
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 ReducerT = Callable[[pd.Series], Any]
 StrOrTupleT = Union[str, Tuple[str, ...]]
+ArtifactT = TypeVar("ArtifactT", bound=Artifact)
+
+LAZY_BATCH_SIZE = 100
+# Number of experiments whose metrics are fetched together while projecting.
+METRICS_BATCH_SIZE = 1000
+# Number of values sent to a worker at once when reducers are applied by a process pool.
+REDUCER_CHUNK_SIZE = 16
 
 
 class QuerySet(UserList):
+    def __init__(
+        self,
+        initlist: Optional[Iterable[Experiment]] = None,
+        query: Optional[dict] = None,
+        projection: Optional[ProjectionT] = None,
+    ):
+        """
+        Args:
+            initlist: The experiments in the query set.
+            query: The mongo query the experiments were retrieved with, which allows `ExperimentLoader.refresh`
+                   to add and remove experiments.
+            projection: The projection the experiments were retrieved with, which `ExperimentLoader.refresh`
+                        retrieves added experiments with.
+        """
+        super().__init__(initlist)
+        self._query = query
+        self._projection = projection
+
     def __repr__(self):
         return f"QuerySet({repr(self.data)})"
 
     def project(
-        self, on: List[Union[StrOrTupleT, Dict[StrOrTupleT, ReducerT]]], rename="last", on_missing: str = "raise"
+        self,
+        on: List[Union[StrOrTupleT, Dict[StrOrTupleT, ReducerT]]],
+        rename="last",
+        on_missing: str = "raise",
+        executor: Optional[Executor] = None,
+        n_jobs: Optional[int] = None,
     ) -> pd.DataFrame:
         """Project a set of experiments onto a dataframe.
 
@@ -31,24 +85,215 @@ class QuerySet(UserList):
         rename: The renaming strategy used to create the column names. Either "last" to take the last element in each
                 path as a column name or None to use the complete paths as column names.
         on_missing: {"raise", "ignore"} Whether to raise an error when missing value is encountered or replace it with
-                    a missing value.
+                    a missing value. Functions are not applied to missing values that are ignored.
+        executor: An executor that applies the functions to the values, e.g. a `ProcessPoolExecutor` for functions
+                  that hold the GIL. The functions and values then have to be picklable. Values are still extracted
+                  from the experiments in the calling thread, and the order of the rows is preserved.
+        n_jobs: The number of threads that apply the functions, if no executor is given. -1 for one thread per CPU.
+                By default, the functions are applied in the calling thread.
 
         Returns
         -------
         A dataframe containing the projected values with the experiment id set as index.
+
+        Raises
+        ------
+        ReducerError: If a function applied by an executor fails on the value of an experiment. Without an executor,
+                      the error of the function is raised as it is.
         """
+        if executor is None and n_jobs is not None:
+            with ThreadPoolExecutor(max_workers=os.cpu_count() if n_jobs == -1 else n_jobs) as executor:
+                return self.project(on, rename=rename, on_missing=on_missing, executor=executor)
+
         stratified_on = self._stratify_mapping(on)
 
         # TODO introduce possibility to pass a list to `rename` once we don't need to support 3.5 any longer.
         rename_mapping = self._make_rename_mapping(stratified_on, rename)
 
-        projected: Dict[StrOrTupleT, List[Any]] = defaultdict(list)
-        for exp in self.data:
-            projected["exp_id"].append(exp.id)
-            for path, reducer in stratified_on.items():
-                projected[path].append(self._extract(exp, path, reducer, on_missing))
+        # Paths reduced by a `MetricReducer` are evaluated in the database.
+        aggregated_on: Dict[Tuple[str, ...], MetricReducer] = {
+            path: reducer
+            for path, reducer in stratified_on.items()
+            if isinstance(reducer, MetricReducer) and len(path) == 2 and path[0] == "metrics"
+        }
+        metric_names = self._find_metric_names(path for path in stratified_on if path not in aggregated_on)
+        # Top-level fields of the run documents, which may have been left out by a projection.
+        fields = {path[0] for path in stratified_on if path[0] == "info" or is_document_path(path[:1])}
 
-        return pd.DataFrame(projected).set_index("exp_id").rename(columns=rename_mapping)
+        # Every path is compiled once and the dataframe is filled column by column.
+        accessors = {
+            path: compile_path(path, fallback=partial(self._resolve, path=path, on_missing=on_missing))
+            for path in stratified_on
+        }
+        exp_ids: List[Any] = []
+        # The parts of each column are lists of values or iterators over the results of an executor.
+        parts: List[List[Iterable[Any]]] = [[] for _ in stratified_on]
+        for batch in _batched(self, METRICS_BATCH_SIZE):
+            if metric_names is None or metric_names:
+                QuerySet(batch).load_metrics(metric_names)
+            if fields:
+                QuerySet(batch).load_fields(fields)
+            aggregated = self._aggregate_metrics(batch, aggregated_on) if aggregated_on else {}
+            exp_ids.extend(exp.id for exp in batch)
+            for column_parts, (path, reducer) in zip(parts, stratified_on.items()):
+                if path in aggregated_on:
+                    metric_reducer = aggregated_on[path]
+                    column_parts.append(
+                        [
+                            self._get_aggregated(aggregated, exp, path, metric_reducer, on_missing)
+                            if isinstance(exp, Experiment)
+                            else metric_reducer(accessors[path](exp))
+                            for exp in batch
+                        ]
+                    )
+                elif callable(reducer):
+                    skip_missing = on_missing == "ignore"
+                    values = map(accessors[path], batch)
+                    if executor is None:
+                        apply = partial(_apply_reducer, reducer, skip_missing=skip_missing)
+                        column_parts.append(list(map(apply, values)))
+                    else:
+                        apply = partial(_apply_reducer_in_executor, reducer, path=path, skip_missing=skip_missing)
+                        batch_ids = [exp.id for exp in batch]
+                        column_parts.append(executor.map(apply, batch_ids, list(values), chunksize=REDUCER_CHUNK_SIZE))
+                else:
+                    column_parts.append(list(map(accessors[path], batch)))
+
+        columns = [list(chain.from_iterable(column_parts)) for column_parts in parts]
+        return make_frame(exp_ids, columns, [rename_mapping[path] for path in stratified_on])
+
+    def load_metrics(self, names: Optional[Iterable[str]] = None) -> None:
+        """Load the metrics of all experiments with a single query.
+
+        The metrics are stored in the experiments, so that subsequent access of
+        `exp.metrics` does not go to the database again. A lazy query set is retrieved first to keep them.
+
+        Args:
+            names: Names of the metrics to load. Defaults to all metrics.
+        """
+        names = None if names is None else set(names)
+        experiments_by_loader = _group_by(
+            (
+                exp
+                for exp in self.data
+                if isinstance(exp, Experiment)
+                and not exp._all_metrics_loaded
+                and (names is None or not names.issubset(exp._metrics))
+            ),
+            key=lambda exp: exp._loader,
+        )
+        for loader, experiments in experiments_by_loader.items():
+            for metric_db_entry in loader._find_metrics(experiments, names):
+                exp = experiments[metric_db_entry["run_id"]]
+                exp._metrics.setdefault(metric_db_entry["name"], metric_db_entry_to_series(metric_db_entry))
+            if names is None:
+                for exp in experiments.values():
+                    exp._all_metrics_loaded = True
+
+    def load_fields(self, fields: Iterable[str]) -> None:
+        """Retrieve top-level fields that were left out by the `fields` or `exclude` argument of a find method.
+
+        The fields of all experiments are fetched with one query per database, instead of one query per
+        experiment when a field is first accessed. A lazy query set is retrieved first to keep them.
+
+        Args:
+            fields: Names of top-level fields of the run documents.
+        """
+        fields = list(fields)
+        experiments_by_database = _group_by_database(
+            exp for exp in self.data if isinstance(exp, Experiment) and any(map(exp._is_missing, fields))
+        )
+        for database, experiments in experiments_by_database.items():
+            projection = {field: 1 for field in fields}
+            for run_ids in _batched(experiments, METRICS_BATCH_SIZE):
+                for run in database.runs.find({"_id": {"$in": run_ids}}, projection):
+                    experiments[run["_id"]]._merge_fields(run, fields)
+
+    def load_artifacts(self) -> None:
+        """Load the artifacts of all experiments, retrieving the metadata of all their files with a single query.
+
+        The content of the artifacts is only downloaded when it is accessed. A lazy query set is retrieved first
+        to keep them.
+        """
+        experiments_by_database = _group_by_database(
+            exp for exp in self.data if isinstance(exp, Experiment) and exp._artifacts is None
+        )
+        for database, experiments in experiments_by_database.items():
+            links = [(exp, link) for exp in experiments.values() for link in exp._get_artifacts_links()]
+            file_ids = [link["file_id"] for _, link in links]
+            file_documents = {
+                document["_id"]: document for document in database.fs.files.find({"_id": {"$in": file_ids}})
+            }
+            artifacts: Dict[int, Dict[str, Artifact]] = {exp_id: {} for exp_id in experiments}
+            for exp, link in links:
+                if link["file_id"] in file_documents:
+                    artifact_file = GridOut(database.fs, file_document=file_documents[link["file_id"]])
+                else:
+                    # Raises the same error as loading the artifacts of the experiment on its own.
+                    artifact_file = exp._grid_filesystem.get(link["file_id"])
+                artifacts[exp.id][link["name"]] = make_artifact(
+                    link["name"], artifact_file, cache=exp._loader._artifact_cache
+                )
+            for exp_id, exp in experiments.items():
+                exp._artifacts = artifacts[exp_id]
+
+    def metrics_frame(self, names: Optional[Iterable[str]] = None, align: str = "step") -> pd.DataFrame:
+        """Collect metrics of all experiments in a single dataframe.
+
+        The metrics are fetched with a single query per loader and assembled without creating a series per metric.
+
+        Args:
+            names: Names of the metrics to include. Defaults to all metrics.
+            align: Either "step" to index the dataframe by step with a column for each metric name and experiment id,
+                   or "run" to index it by experiment id and step with a column for each metric name.
+
+        Returns:
+            A dataframe containing the metric values.
+        """
+        if align not in ("step", "run"):
+            raise ValueError(f'align can be either "step" or "run", but was {align}.')
+        names = None if names is None else list(names)
+
+        run_ids: List[Any] = []
+        metric_names: List[str] = []
+        lengths: List[int] = []
+        steps: List[Any] = []
+        values: List[Any] = []
+
+        def add_metric(run_id, name, metric_steps, metric_values):
+            run_ids.append(run_id)
+            metric_names.append(name)
+            lengths.append(len(metric_steps))
+            steps.extend(metric_steps)
+            values.extend(metric_values)
+
+        experiments = list(self)
+        for exp in experiments:
+            if not isinstance(exp, Experiment):
+                for name, metric in exp.metrics.items():
+                    if names is None or name in names:
+                        add_metric(exp.id, name, metric.index, metric.values)
+        experiments_by_loader = _group_by(
+            (exp for exp in experiments if isinstance(exp, Experiment)), key=lambda exp: exp._loader
+        )
+        for loader, experiments_by_id in experiments_by_loader.items():
+            for entry in loader._find_metrics(experiments_by_id, names):
+                add_metric(entry["run_id"], entry["name"], entry["steps"], entry["values"])
+
+        long_frame = pd.DataFrame(
+            {
+                "exp_id": pd.Index(run_ids).repeat(lengths),
+                "step": np.asarray(steps),
+                "name": np.repeat(np.asarray(metric_names, dtype=object), lengths),
+                "value": np.asarray(values),
+            }
+        )
+        # A step logged more than once keeps its last value, as pivoting requires unique steps.
+        long_frame = long_frame.drop_duplicates(["exp_id", "step", "name"], keep="last")
+        metrics = long_frame.set_index(["exp_id", "step", "name"])["value"].unstack("name")
+        if align == "step":
+            metrics = metrics.unstack("exp_id").sort_index(axis="columns")
+        return metrics.sort_index()
 
     def delete(self, confirmed: bool = False):
         """Delete all experiments together with their% artifacts and metrics.
@@ -59,15 +304,17 @@ class QuerySet(UserList):
         if not confirmed:
             confirmed = input(f"Are you sure you want to delete {self}? [y/N]") == "y"
         if confirmed:
-            for exp in self.data:
+            # Deleting an experiment removes it from `self.data` if this query set is cached by the loader.
+            experiments = self.data
+            for exp in experiments:
                 exp.delete(confirmed=True)
-            print(f"Deleted {len(self.data)} experiments")
+            print(f"Deleted {len(experiments)} experiments")
             self.data: List[Experiment] = []
         else:
             print("Deletion aborted")
 
-    def _make_rename_mapping(self, on, rename: Optional[str]) -> Dict[str, str]:
-        rename_mapping = {}
+    def _make_rename_mapping(self, on, rename: Optional[str]) -> Dict[Tuple[str, ...], str]:
+        rename_mapping: Dict[Tuple[str, ...], str] = {}
         for path, reducer_or_path in on.items():
             if rename == "last":
                 str_path = path[-1]
@@ -99,12 +346,42 @@ class QuerySet(UserList):
 
         return on
 
-    def _extract(self, exp: Experiment, path, name, on_missing):
-        extracted = reduce(lambda x, y: self._get(x, y, on_missing), path, exp)
-        if isinstance(name, str):
-            return extracted
-        elif callable(name):
-            return name(extracted)
+    def _aggregate_metrics(self, experiments, on: Dict[Tuple[str, ...], MetricReducer]) -> Dict[Tuple[int, str], dict]:
+        names = {path[1] for path in on}
+        reducers = {reducer.__name__: reducer for reducer in on.values()}.values()
+        aggregated = {}
+        for database, experiments_by_id in _group_by_database(experiments).items():
+            aggregated.update(aggregate_metrics(database, experiments_by_id, names, reducers))
+        return aggregated
+
+    def _get_aggregated(self, aggregated, exp: Experiment, path, reducer: MetricReducer, on_missing):
+        reduced = aggregated.get((exp.id, path[1]))
+        if reduced is None:
+            if on_missing == "ignore":
+                return None
+            else:
+                raise KeyError(path[1])
+        return reduced.get(reducer.__name__)
+
+    def _find_metric_names(self, on) -> Optional[Set[str]]:
+        """Find the names of the metrics that are accessed by a projection.
+
+        Returns None if all metrics are needed.
+        """
+        metric_names = set()
+        for path in on:
+            if path[0] == "metrics":
+                if len(path) == 1:
+                    return None
+                metric_names.add(path[1])
+        return metric_names
+
+    def _resolve(self, exp: Experiment, path, on_missing):
+        root: Any = exp
+        if isinstance(exp, Experiment) and path[0] == "metrics" and len(path) > 1:
+            # Read metrics loaded by `load_metrics` without loading all other metrics of the experiment.
+            root, path = exp._metrics, path[1:]
+        return reduce(lambda x, y: self._get(x, y, on_missing), path, root)
 
     def _get(self, o, name, on_missing):
         """Try getattr and getitem."""
@@ -124,6 +401,155 @@ class QuerySet(UserList):
         return ArtifactIndexer(self)
 
 
+def _apply_reducer(reducer: ReducerT, value: Any, skip_missing: bool) -> Any:
+    if skip_missing and value is None:
+        return None
+    return reducer(value)
+
+
+def _apply_reducer_in_executor(
+    reducer: ReducerT, exp_id: Any, value: Any, path: Tuple[str, ...], skip_missing: bool
+) -> Any:
+    """Apply a reducer in an executor, which cannot tell which experiment a raised error belongs to."""
+    try:
+        return _apply_reducer(reducer, value, skip_missing)
+    except Exception as exc:
+        raise ReducerError(exp_id, path, exc) from exc
+
+
+def _group_by(experiments: Iterable[Experiment], key: Callable[[Experiment], Any]) -> Dict[Any, Dict[int, Experiment]]:
+    """Group experiments, e.g. by the database they were loaded from, and index each group by experiment id."""
+    groups: Dict[Any, Dict[int, Experiment]] = defaultdict(dict)
+    for exp in experiments:
+        groups[key(exp)][exp.id] = exp
+    return groups
+
+
+def _group_by_database(experiments: Iterable[Experiment]) -> Dict[Any, Dict[int, Experiment]]:
+    return _group_by(experiments, key=lambda exp: exp._database)
+
+
+def _batched(iterable: Iterable, n: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, n))
+        if not batch:
+            return
+        yield batch
+
+
+class LazyQuerySet(QuerySet):
+    """A query set that only retrieves its experiments from the database while it is iterated.
+
+    Length and integer or contiguous slice access are answered with `count_documents`, `skip` and `limit`
+    instead of loading all experiments. Any other list operation loads the experiments once and keeps them.
+    """
+
+    def __init__(
+        self,
+        collection,
+        query: dict,
+        make_experiment: Callable[[dict], Experiment],
+        projection: Optional[ProjectionT] = None,
+        batch_size: int = LAZY_BATCH_SIZE,
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ):
+        super().__init__(query=query, projection=projection)
+        # The experiments are only retrieved when `data` is first accessed, see `__getattr__`.
+        del self.data
+        self._collection = collection
+        self._make_experiment = make_experiment
+        self._batch_size = batch_size
+        self._skip = skip
+        self._limit = limit
+        self._len: Optional[int] = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(query={self._query!r})"
+
+    def __getattr__(self, item):
+        if item != "data" or "_collection" not in self.__dict__:
+            raise AttributeError(item)
+        self.data = list(self._iter_experiments(self._skip, self._limit))
+        return self.data
+
+    @property
+    def _loaded(self) -> bool:
+        """Whether the experiments were retrieved and are kept in `data`."""
+        return "data" in self.__dict__
+
+    def __iter__(self) -> Iterator[Experiment]:
+        if self._loaded:
+            return iter(self.data)
+        return self._iter_experiments(self._skip, self._limit)
+
+    def __len__(self) -> int:
+        if self._loaded:
+            return len(self.data)
+        if self._limit == 0:
+            return 0
+        if self._len is None:
+            count_kwargs = {"skip": self._skip}
+            if self._limit is not None:
+                count_kwargs["limit"] = self._limit
+            self._len = self._collection.count_documents(self._query, **count_kwargs)
+        return self._len
+
+    def __getitem__(self, item):
+        if self._loaded:
+            return QuerySet(self.data[item]) if isinstance(item, slice) else self.data[item]
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return QuerySet(islice(self, start, stop, step))
+            return LazyQuerySet(
+                self._collection,
+                self._query,
+                self._make_experiment,
+                projection=self._projection,
+                batch_size=self._batch_size,
+                skip=self._skip + start,
+                limit=max(stop - start, 0),
+            )
+        if item < 0:
+            item += len(self)
+        if item < 0 or (self._limit is not None and item >= self._limit):
+            raise IndexError("LazyQuerySet index out of range")
+        try:
+            return next(self._iter_experiments(self._skip + item, 1))
+        except StopIteration:
+            raise IndexError("LazyQuerySet index out of range")
+
+    # List operations that create a new list return an eager `QuerySet`.
+    def __add__(self, other):
+        return QuerySet(self.data) + other
+
+    def __radd__(self, other):
+        return other + QuerySet(self.data)
+
+    def __mul__(self, n):
+        return QuerySet(self.data * n)
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        return QuerySet(self.data)
+
+    def _iter_experiments(self, skip: int, limit: Optional[int]) -> Iterator[Experiment]:
+        if limit == 0:
+            return
+        cursor = (
+            self._collection.find(self._query, None if self._projection is None else dict(self._projection))
+            .sort("_id", 1)
+            .skip(skip)
+            .limit(limit or 0)
+            .batch_size(self._batch_size)
+        )
+        for run in cursor:
+            yield self._make_experiment(run)
+
+
 class ArtifactIndexer:
     def __init__(self, experiments: QuerySet):
         self._experiments = experiments
@@ -141,6 +567,7 @@ class ArtifactIndexer:
         Returns:
 
         """
+        self._experiments.load_artifacts()
         return ArtifactSet(
             artifact
             for exp in self._experiments
@@ -149,11 +576,158 @@ class ArtifactIndexer:
         )
 
     def __getitem__(self, item):
+        self._experiments.load_artifacts()
         return ArtifactSet(exp.artifacts[item] for exp in self._experiments)
 
 
 class ArtifactSet(UserList):
-    def save(self, to_dir, n_threads=None):
-        with ThreadPoolExecutor(max_workers=n_threads) as executer:
-            for artifact in self.data:
-                executer.submit(artifact.save, to_dir=to_dir)
+    def fetch(self, n_threads: Optional[int] = None, progress: Optional[Callable[[int, int], None]] = None) -> None:
+        """Download the content of all artifacts concurrently.
+
+        Args:
+            n_threads: The maximum number of concurrent downloads. Defaults to the default of `ThreadPoolExecutor`.
+            progress: Called with the number of finished and the total number of artifacts after each download.
+
+        Raises:
+            ArtifactSetError: If any download failed, after all others have finished.
+        """
+        self._map(self.data, lambda artifact: artifact.content, n_threads, progress)
+
+    def save(
+        self, to_dir, n_threads: Optional[int] = None, progress: Optional[Callable[[int, int], None]] = None
+    ) -> None:
+        """Save all artifacts to disk concurrently.
+
+        Args:
+            to_dir: Directory in which to save the artifacts.
+            n_threads: The maximum number of concurrent downloads. Defaults to the default of `ThreadPoolExecutor`.
+            progress: Called with the number of finished and the total number of artifacts after each artifact.
+
+        Raises:
+            ArtifactSetError: If any artifact could not be saved, after all others have been saved.
+        """
+        self._map(self.data, lambda artifact: artifact.save(to_dir=to_dir), n_threads, progress)
+
+    def to_frame(
+        self,
+        usecols: Optional[Sequence[str]] = None,
+        dtype: Union[None, str, type, Dict[str, Any]] = None,
+        engine: Optional[str] = None,
+        n_threads: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> pd.DataFrame:
+        """Parse CSV artifacts concurrently and concatenate them into one dataframe.
+
+        Args:
+            usecols: The columns to parse. All columns if None.
+            dtype: The type of all columns or a mapping from column names to types. Inferred if None.
+            engine: {"c", "python", "pyarrow"} The parser engine of `pandas.read_csv`.
+            n_threads: The maximum number of artifacts that are downloaded and parsed at once.
+            progress: Called with the number of finished and the total number of artifacts after each artifact.
+
+        Returns:
+            A dataframe with the id of the experiment each row stems from as the outer level of its index.
+
+        Raises:
+            TypeError: If any artifact is not a CSV artifact.
+            ArtifactSetError: If any artifact could not be parsed, after all others have been parsed.
+        """
+        csv_artifacts = [artifact for artifact in self.data if isinstance(artifact, CSVArtifact)]
+        if len(csv_artifacts) < len(self.data):
+            not_csv = [artifact for artifact in self.data if not isinstance(artifact, CSVArtifact)]
+            raise TypeError(f"Only CSV artifacts can be turned into a dataframe, but got {not_csv}.")
+        frames = self._map(
+            csv_artifacts,
+            lambda artifact: artifact.to_frame(usecols=usecols, dtype=dtype, engine=engine),
+            n_threads,
+            progress,
+        )
+        return pd.concat(frames, keys=[artifact._exp_id() for artifact in csv_artifacts], names=["exp_id"])
+
+    def to_table(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        n_threads: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> "pa.Table":
+        """Read Parquet or Arrow artifacts concurrently and concatenate them into one Arrow table.
+
+        Args:
+            columns: The columns to read. All columns if None.
+            n_threads: The maximum number of artifacts that are downloaded and read at once.
+            progress: Called with the number of finished and the total number of artifacts after each artifact.
+
+        Returns:
+            A table with an additional "exp_id" column holding the id of the experiment each row stems from.
+
+        Raises:
+            TypeError: If any artifact is neither a Parquet nor an Arrow artifact.
+            ArtifactSetError: If any artifact could not be read, after all others have been read.
+        """
+        table_artifacts = [artifact for artifact in self.data if isinstance(artifact, (ParquetArtifact, ArrowArtifact))]
+        if len(table_artifacts) < len(self.data):
+            not_tables = [
+                artifact for artifact in self.data if not isinstance(artifact, (ParquetArtifact, ArrowArtifact))
+            ]
+            raise TypeError(f"Only Parquet and Arrow artifacts can be turned into a table, but got {not_tables}.")
+        pa = _import_pyarrow()
+        tables = self._map(table_artifacts, lambda artifact: artifact.to_table(columns=columns), n_threads, progress)
+        tables = [
+            table.append_column("exp_id", pa.array([artifact._exp_id()] * table.num_rows))
+            for artifact, table in zip(table_artifacts, tables)
+        ]
+        return pa.concat_tables(tables)
+
+    def _map(
+        self,
+        artifacts: List[ArtifactT],
+        func: Callable[[ArtifactT], Any],
+        n_threads: Optional[int],
+        progress: Optional[Callable[[int, int], None]],
+    ) -> List[Any]:
+        """Apply a function to the given artifacts concurrently and return the results in their order."""
+        errors: List[Tuple[Artifact, BaseException]] = []
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            futures = {executor.submit(func, artifact): artifact for artifact in artifacts}
+            for n_done, future in enumerate(as_completed(futures), start=1):
+                error = future.exception()
+                if error is not None:
+                    errors.append((futures[future], error))
+                if progress is not None:
+                    progress(n_done, len(futures))
+        if errors:
+            raise ArtifactSetError(errors) from errors[0][1]
+        return [future.result() for future in futures]
+
+
+class ArtifactSetError(Exception):
+    """Raised when some artifacts of an `ArtifactSet` could not be processed.
+
+    Attributes:
+        errors: Pairs of each failed artifact and the exception it raised.
+    """
+
+    def __init__(self, errors: List[Tuple[Artifact, BaseException]]):
+        self.errors = errors
+        names = ", ".join(artifact.name for artifact, _ in errors)
+        super().__init__(f"{len(errors)} artifacts failed ({names}). The first error was: {errors[0][1]!r}")
+
+
+class ReducerError(Exception):
+    """Raised when a function of `QuerySet.project` that is applied by an executor fails on the value of an experiment.
+
+    Attributes:
+        exp_id: The id of the experiment.
+        path: The path of the value.
+        error: The exception raised by the function.
+    """
+
+    def __init__(self, exp_id: Any, path: Tuple[str, ...], error: BaseException):
+        self.exp_id = exp_id
+        self.path = path
+        self.error = error
+        super().__init__(f"Reducing {'.'.join(path)} of experiment {exp_id} failed: {error!r}")
+
+    def __reduce__(self):
+        # Keeps the error picklable, so that it can be raised in a `ProcessPoolExecutor`.
+        return self.__class__, (self.exp_id, self.path, self.error)
@@ -0,0 +1,63 @@
+from typing import *
+
+import pandas as pd
+
+
+class MetricReducer:
+    """A reducer for metrics that has an equivalent aggregation expression.
+
+    When passed to `QuerySet.project`, e.g. ``exps.project(on=[{"metrics.loss": reducers.mean}])``,
+    the metric is reduced inside the database and only the reduced value is transferred.
+    """
+
+    def __init__(self, name: str, func: Callable[[pd.Series], Any], expression: dict):
+        self.__name__ = name
+        self._func = func
+        self.expression = expression
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.__name__})"
+
+    def __call__(self, metric: pd.Series) -> Any:
+        return self._func(metric)
+
+
+def _step_at(index_expression: dict) -> dict:
+    return {"$arrayElemAt": ["$steps", {"$indexOfArray": ["$values", index_expression]}]}
+
+
+# Like pandas, mean, min, max, argmin and argmax skip NaN and null values.
+# The reducers of the minimum and maximum are named `min_` and `max_` so as not to shadow the builtins.
+# Both compare less than negative infinity in MongoDB.
+_valid_values = {"$filter": {"input": "$values", "cond": {"$gte": ["$$this", float("-inf")]}}}
+
+mean = MetricReducer("mean", lambda metric: metric.mean(), {"$avg": _valid_values})
+min_ = MetricReducer("min", lambda metric: metric.min(), {"$min": _valid_values})
+max_ = MetricReducer("max", lambda metric: metric.max(), {"$max": _valid_values})
+first = MetricReducer("first", lambda metric: metric.iloc[0], {"$arrayElemAt": ["$values", 0]})
+last = MetricReducer("last", lambda metric: metric.iloc[-1], {"$arrayElemAt": ["$values", -1]})
+count = MetricReducer("count", len, {"$size": "$values"})
+argmin = MetricReducer("argmin", lambda metric: metric.idxmin(), _step_at({"$min": _valid_values}))
+argmax = MetricReducer("argmax", lambda metric: metric.idxmax(), _step_at({"$max": _valid_values}))
+
+
+def aggregate_metrics(
+    database, run_ids: Iterable[int], names: Iterable[str], reducers: Iterable[MetricReducer]
+) -> Dict[Tuple[int, str], dict]:
+    """Reduce metrics inside the database.
+
+    Args:
+        database: The database holding the metrics collection.
+        run_ids: The ids of the runs whose metrics are reduced.
+        names: The names of the metrics to reduce.
+        reducers: The reducers to apply to every metric.
+
+    Returns:
+        A mapping from run id and metric name to a mapping from reducer name to reduced value.
+    """
+    expressions: Dict[str, Any] = {reducer.__name__: reducer.expression for reducer in reducers}
+    pipeline = [
+        {"$match": {"run_id": {"$in": list(run_ids)}, "name": {"$in": list(names)}}},
+        {"$project": {"_id": 0, "run_id": 1, "name": 1, **expressions}},
+    ]
+    return {(reduced["run_id"], reduced["name"]): reduced for reduced in database.metrics.aggregate(pipeline)}
@@ -0,0 +1,190 @@
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import *
+
+import pandas as pd
+from pymongo.errors import PyMongoError
+
+from .experiment import Experiment, metric_db_entry_to_series
+from .persistent_cache import is_final
+
+# `$slice` in a projection needs an explicit number of elements to return.
+MAX_SLICE = 2**31 - 1
+
+
+class ExperimentUpdate(NamedTuple):
+    """The run document of a watched experiment changed, or a new experiment matched the query."""
+
+    experiment: Experiment
+
+
+class MetricUpdate(NamedTuple):
+    """New points were logged for a metric of a watched experiment."""
+
+    experiment: Experiment
+    name: str
+    points: pd.Series
+
+
+UpdateT = Union[ExperimentUpdate, MetricUpdate]
+
+
+class Watcher:
+    """Follows the runs that match a query and the metrics they log.
+
+    Changes are detected with change streams on the `runs` and `metrics` collections if the database
+    supports them, and otherwise by polling for runs with a newer heartbeat. In both cases only
+    the new points of a metric are transferred, which are appended to the metrics already loaded
+    into the experiment.
+
+    Iterate the watcher to receive updates as they arrive, or call `poll` to receive
+    the updates since the previous call.
+
+    Args:
+        loader: The loader whose database is watched.
+        query: A mongo query selecting the runs to watch.
+        poll_interval: Seconds to wait for changes before checking again.
+        timeout: Seconds after which iteration stops. Iterate forever if None.
+        change_streams: Whether to use change streams. If None, they are used if the database supports them.
+    """
+
+    def __init__(
+        self,
+        loader,
+        query: dict,
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None,
+        change_streams: Optional[bool] = None,
+    ):
+        self._loader = loader
+        self._query = query
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._last_poll = datetime.utcnow()
+        # Open the change stream first, so that no change between loading the experiments and watching is missed.
+        self._stream = None
+        if change_streams is not False:
+            self._stream = self._open_change_stream()
+            if change_streams and self._stream is None:
+                raise ValueError(f'Database "{loader._database.name}" does not support change streams.')
+        run_ids = [run["_id"] for run in loader._runs.find(query, {"_id": 1})]
+        self.experiments: Dict[Any, Experiment] = {
+            experiment.id: experiment for experiment in loader.find_by_ids(run_ids)
+        }
+        # Maps the ids of metric documents to their run id and the number of points seen so far.
+        self._seen: Dict[Any, Tuple[Any, int]] = {}
+        for entry in self._metric_lengths(run_ids):
+            loaded = self.experiments[entry["run_id"]]._metrics.get(entry["name"])
+            self._seen[entry["_id"]] = (entry["run_id"], entry["length"] if loaded is None else len(loaded))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(query={self._query!r})"
+
+    def __iter__(self) -> Iterator[UpdateT]:
+        start = time.monotonic()
+        while self.timeout is None or time.monotonic() - start < self.timeout:
+            yield from self.poll()
+            if self._stream is None:
+                time.sleep(self.poll_interval)
+
+    def poll(self) -> List[UpdateT]:
+        """Retrieve the changes since the previous poll.
+
+        Returns:
+            An `ExperimentUpdate` for every changed or new experiment,
+            followed by a `MetricUpdate` for every metric with new points.
+        """
+        poll_time = datetime.utcnow()
+        if self._stream is None:
+            changed_query = self._loader._changed_since(self._last_poll)
+            metric_run_ids = {
+                run_id for run_id, experiment in self.experiments.items() if not is_final(experiment._document)
+            }
+        else:
+            run_ids, metric_run_ids = self._drain_change_stream(self._stream)
+            changed_query = {"_id": {"$in": list(run_ids)}}
+
+        updates: List[UpdateT] = []
+        for run in self._loader._runs.find({"$and": [self._query, changed_query]}):
+            experiment = self.experiments.get(run["_id"])
+            if experiment is None:
+                experiment = self.experiments[run["_id"]] = self._loader._make_experiment(run)
+            elif run == experiment._document:
+                continue
+            else:
+                experiment._update(run, keep_metrics=True)
+            metric_run_ids.add(experiment.id)
+            updates.append(ExperimentUpdate(experiment))
+
+        updates.extend(self._poll_metrics(metric_run_ids))
+        self._last_poll = poll_time
+        return updates
+
+    def close(self):
+        """Close the change stream, if one is used."""
+        if self._stream is not None:
+            self._stream.close()
+
+    def _open_change_stream(self):
+        pipeline = [{"$match": {"ns.coll": {"$in": ["runs", "metrics"]}}}]
+        try:
+            return self._loader._database.watch(pipeline, max_await_time_ms=int(self.poll_interval * 1000))
+        except (PyMongoError, TypeError):
+            # Standalone servers do not support change streams and mongomock does not implement them.
+            return None
+
+    def _drain_change_stream(self, stream) -> Tuple[Set[Any], Set[Any]]:
+        """Collect the ids of changed runs and the ids of runs with changed metrics from the open change stream."""
+        run_ids, metric_run_ids = set(), set()
+        change = stream.try_next()
+        while change is not None:
+            if change["ns"]["coll"] == "runs":
+                run_ids.add(change["documentKey"]["_id"])
+            elif change["operationType"] == "insert":
+                metric_run_ids.add(change["fullDocument"]["run_id"])
+            elif change["documentKey"]["_id"] in self._seen:
+                metric_run_ids.add(self._seen[change["documentKey"]["_id"]][0])
+            change = stream.try_next()
+        return run_ids, {run_id for run_id in metric_run_ids if run_id in self.experiments}
+
+    def _poll_metrics(self, run_ids: Collection[Any]) -> List[MetricUpdate]:
+        if not run_ids:
+            return []
+        # Metric documents with new points are retrieved together if the same number of points was seen.
+        by_offset = defaultdict(list)
+        for entry in self._metric_lengths(run_ids):
+            _, offset = self._seen.setdefault(entry["_id"], (entry["run_id"], 0))
+            if entry["length"] > offset:
+                by_offset[offset].append(entry["_id"])
+
+        updates = []
+        for offset, metric_ids in by_offset.items():
+            projection = {
+                "run_id": 1,
+                "name": 1,
+                "steps": {"$slice": [offset, MAX_SLICE]},
+                "values": {"$slice": [offset, MAX_SLICE]},
+            }
+            for entry in self._loader._database.metrics.find({"_id": {"$in": metric_ids}}, projection):
+                points = metric_db_entry_to_series(entry)
+                self._seen[entry["_id"]] = (entry["run_id"], offset + len(points))
+                experiment = self.experiments[entry["run_id"]]
+                _extend_metric(experiment, entry["name"], points)
+                updates.append(MetricUpdate(experiment, entry["name"], points))
+        return updates
+
+    def _metric_lengths(self, run_ids: Iterable[Any]) -> Iterator[dict]:
+        pipeline = [
+            {"$match": {"run_id": {"$in": list(run_ids)}}},
+            {"$project": {"run_id": 1, "name": 1, "length": {"$size": "$steps"}}},
+        ]
+        return self._loader._database.metrics.aggregate(pipeline)
+
+
+def _extend_metric(experiment: Experiment, name: str, points: pd.Series):
+    """Append new points to a metric that was already loaded into an experiment."""
+    if name in experiment._metrics:
+        experiment._metrics[name] = pd.concat([experiment._metrics[name], points])
+    elif experiment._all_metrics_loaded:
+        experiment._metrics[name] = points
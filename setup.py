@@ -27,9 +27,9 @@ setup(
         "matplotlib>=3",
         "pandas>=0.23",
         "jupyterlab>=1.0",
-        "pymongo>=3.7",
-        "pyrsistent>=0.15.2",
+        "pymongo>=3.9",
     ],
+    extras_require={"async": ["motor>=2.1"], "arrow": ["pyarrow>=1.0"]},
     include_package_data=True,
     classifiers=[
         "Development Status :: 3 - Alpha",
@@ -3,12 +3,15 @@ import os
 import pickle
 
 import IPython
+import numpy as np
 import pandas as pd
 import pytest
 from IPython.display import HTML
 from pytest import raises
 
-from incense import artifact
+from incense import ExperimentLoader, artifact
+
+from .conftest import MONGO_URI, TEST_DB_NAME
 
 
 def test_repr(loader):
@@ -34,6 +37,35 @@ def test_png_artifact_save(loader, tmpdir):
     assert imghdr.what(filepath) == "png"
 
 
+def test_save__streams_without_keeping_content(loader, tmpdir):
+    exp = loader.find_by_id(3)
+    png_artifact = exp.artifacts["confusion_matrix"]
+    png_artifact.save(to_dir=tmpdir, chunk_size=1024)
+    assert png_artifact._content is None
+    assert os.listdir(str(tmpdir)) == ["3_confusion_matrix.png"]
+    with open(str(tmpdir / "3_confusion_matrix.png"), "rb") as file:
+        assert file.read() == png_artifact.content
+
+
+def test_iter_chunks(loader):
+    exp = loader.find_by_id(3)
+    png_artifact = exp.artifacts["confusion_matrix"]
+    chunks = list(png_artifact.iter_chunks(chunk_size=1024))
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert b"".join(chunks) == png_artifact.content
+
+
+def test_artifact_cache(tmpdir):
+    loader = ExperimentLoader(mongo_uri=MONGO_URI, db_name=TEST_DB_NAME, artifact_cache_dir=tmpdir / "cache")
+    csv_artifact = loader.find_by_id(3).artifacts["predictions"]
+    assert isinstance(csv_artifact.render(), pd.DataFrame)
+    assert loader._artifact_cache.get(csv_artifact._cache_key()) is not None
+
+    csv_artifact.save(to_dir=tmpdir / "saved")
+    assert os.stat(str(tmpdir / "saved" / "3_predictions.csv")).st_nlink == 2
+    assert csv_artifact.content == loader._artifact_cache.get(csv_artifact._cache_key()).read_bytes()
+
+
 def test_csv_artifact_render(loader):
     exp = loader.find_by_id(3)
     csv_artifact = exp.artifacts["predictions"]
@@ -41,6 +73,23 @@ def test_csv_artifact_render(loader):
     assert isinstance(csv_artifact.render(), pd.DataFrame)
 
 
+def test_csv_artifact_to_frame(loader):
+    csv_artifact = loader.find_by_id(3).artifacts["predictions"]
+    full = csv_artifact.render()
+    column = full.columns[0]
+    df = csv_artifact.to_frame(usecols=[column], dtype={column: "float64"})
+    assert df.columns.tolist() == [column]
+    assert df[column].tolist() == full[column].astype("float64").tolist()
+    assert csv_artifact.to_frame(usecols=[column], dtype={column: "float64"}) is df
+
+
+def test_csv_artifact_to_frame__in_chunks(loader):
+    csv_artifact = loader.find_by_id(3).artifacts["predictions"]
+    chunks = list(csv_artifact.to_frame(chunksize=1))
+    assert all(len(chunk) == 1 for chunk in chunks)
+    assert pd.concat(chunks).equals(csv_artifact.render())
+
+
 def test_csv_artifact_render_warning(loader):
     exp = loader.find_by_id(3)
     csv_artifact = exp.artifacts["predictions"]
@@ -134,3 +183,52 @@ def test_artifact_save_with_unknown_content_type(loader, tmpdir):
     exp.artifacts["predictions_df"].save(to_dir=tmpdir)
     filepath = str(tmpdir / "3_predictions_df")
     assert os.path.isfile(filepath)
+
+
+def test_as_numpy__memory_maps_local_files(tmpdir):
+    np.save(str(tmpdir / "array.npy"), np.arange(10))
+    with open(str(tmpdir / "array.npy"), "rb") as file:
+        array = artifact.Artifact("array.npy", file).as_numpy()
+    assert isinstance(array, np.memmap)
+    assert array.tolist() == list(range(10))
+
+
+def test_as_buffer(tmpdir):
+    with open(str(tmpdir / "data.bin"), "wb") as file:
+        file.write(b"abc")
+    with open(str(tmpdir / "data.bin"), "rb") as file:
+        data_artifact = artifact.Artifact("data.bin", file)
+        buffer = data_artifact.as_buffer()
+    assert buffer.readonly
+    assert bytes(buffer) == b"abc"
+    assert data_artifact._content is None
+
+
+def test_as_buffer__from_gridfs(loader):
+    png_artifact = loader.find_by_id(3).artifacts["confusion_matrix"]
+    assert bytes(png_artifact.as_buffer()) == png_artifact.content
+
+
+def test_parquet_artifact_to_table(tmpdir):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    pq.write_table(
+        pa.table({"x": [1, 2, 3, 4], "y": [0.1, 0.2, 0.3, 0.4]}), str(tmpdir / "data.parquet"), row_group_size=2
+    )
+    with open(str(tmpdir / "data.parquet"), "rb") as file:
+        parquet_artifact = artifact.ParquetArtifact("data.parquet", file)
+        table = parquet_artifact.to_table(columns=["x"], row_groups=[1])
+        assert table.to_pydict() == {"x": [3, 4]}
+        assert parquet_artifact.to_table(columns=["x"], row_groups=[1]) is table
+        assert parquet_artifact.render().shape == (4, 2)
+
+
+def test_arrow_artifact_to_table(tmpdir):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.feather as feather
+
+    feather.write_feather(pa.table({"x": [1, 2], "y": ["a", "b"]}), str(tmpdir / "data.arrow"))
+    with open(str(tmpdir / "data.arrow"), "rb") as file:
+        arrow_artifact = artifact.ArrowArtifact("data.arrow", file, content_type="application/vnd.apache.arrow.file")
+        assert arrow_artifact.to_frame(columns=["y"]).to_dict("list") == {"y": ["a", "b"]}
@@ -0,0 +1,45 @@
+import os
+
+from incense.artifact_cache import ArtifactCache, link_or_copy
+
+
+def test_put_and_get(tmpdir):
+    cache = ArtifactCache(tmpdir)
+    path = cache.put("file-1", [b"ab", b"c"])
+    assert path.read_bytes() == b"abc"
+    assert cache.get("file-1") == path
+    assert cache.get("file-2") is None
+    assert cache.size == 3
+
+
+def test_eviction_of_least_recently_used_files(tmpdir):
+    cache = ArtifactCache(tmpdir, max_size=10)
+    for i, key in enumerate(["a", "b"]):
+        path = cache.put(key, [b"x" * 4])
+        os.utime(path, (i, i))
+    cache.put("c", [b"x" * 4])
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.size == 8
+
+
+def test_file_larger_than_cache_is_kept_until_next_put(tmpdir):
+    cache = ArtifactCache(tmpdir, max_size=2)
+    assert cache.put("a", [b"abc"]).exists()
+
+
+def test_clear(tmpdir):
+    cache = ArtifactCache(tmpdir)
+    cache.put("a", [b"abc"])
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_link_or_copy(tmpdir):
+    cache = ArtifactCache(tmpdir / "cache")
+    source = cache.put("a", [b"abc"])
+    destination = str(tmpdir / "a")
+    link_or_copy(source, destination)
+    with open(destination, "rb") as file:
+        assert file.read() == b"abc"
@@ -0,0 +1,72 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from pytest import raises
+
+from .conftest import MONGO_URI, TEST_DB_NAME
+
+pytest.importorskip("motor")
+
+from incense import artifact
+from incense.async_experiment_loader import AsyncExperimentLoader
+from incense.experiment import Experiment
+
+
+@pytest.fixture
+def async_loader():
+    return AsyncExperimentLoader(mongo_uri=MONGO_URI, db_name=TEST_DB_NAME)
+
+
+def test_find_by_ids(async_loader, loader):
+    exps = asyncio.run(async_loader.find_by_ids([3, 1]))
+    assert [exp.id for exp in exps] == [3, 1]
+    assert exps[0].to_dict() == loader.find_by_id(3).to_dict()
+
+
+def test_find_by_id__in_successive_event_loops(async_loader):
+    assert asyncio.run(async_loader.find_by_id(1)).id == 1
+    async_loader.cache_clear()
+    assert asyncio.run(async_loader.find_by_id(1)).id == 1
+
+
+def test_find_by_ids__missing_ids(async_loader):
+    with raises(ValueError, match=r"Experiments with ids \[4\] do not exist"):
+        asyncio.run(async_loader.find_by_ids([1, 4]))
+
+
+def test_find_and_find_latest_concurrently(async_loader):
+    async def find():
+        return await asyncio.gather(async_loader.find({"config.optimizer": "adam"}), async_loader.find_latest())
+
+    exps, latest = asyncio.run(find())
+    assert [exp.id for exp in exps] == [2]
+    assert isinstance(latest, Experiment)
+
+
+def test_load_metrics_and_artifacts(async_loader):
+    async def load():
+        exps = await async_loader.find_by_ids([1, 3])
+        await asyncio.gather(async_loader.load_metrics(exps), async_loader.load_artifacts(exps))
+        return exps
+
+    exps = asyncio.run(load())
+    assert isinstance(exps[0].metrics["training_loss"], pd.Series)
+    assert isinstance(exps[1].artifacts["predictions"], artifact.CSVArtifact)
+    assert isinstance(exps[1].artifacts["predictions"].render(), pd.DataFrame)
+
+
+def test_metrics_are_not_loaded_synchronously(async_loader):
+    exp = asyncio.run(async_loader.find_by_id(1))
+    with raises(RuntimeError, match="load_metrics"):
+        exp.metrics
+
+
+def test_load_artifacts__by_name(async_loader):
+    async def load():
+        exps = await async_loader.find_by_ids([3])
+        await async_loader.load_artifacts(exps, names=["predictions"], n_concurrent=1)
+        return exps
+
+    exps = asyncio.run(load())
+    assert list(exps[0].artifacts) == ["predictions"]
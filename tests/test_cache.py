@@ -0,0 +1,75 @@
+from incense.cache import MISSING, ResultCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hits_and_misses():
+    cache = ResultCache()
+    assert cache.get("a") is MISSING
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    info = cache.info()
+    assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+
+
+def test_eviction_by_number_of_entries():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.info().evictions == 1
+
+
+def test_eviction_by_size():
+    cache = ResultCache(max_bytes=10, sizeof=len)
+    cache.put("a", "x" * 6)
+    cache.put("b", "x" * 6)
+    assert cache.get("a") is MISSING
+    assert cache.info().nbytes == 6
+
+
+def test_expiry():
+    timer = FakeTimer()
+    cache = ResultCache(timer=timer)
+    cache.put("running", 1, ttl=10)
+    cache.put("completed", 2)
+    timer.now = 11
+    assert cache.get("running") is MISSING
+    assert cache.get("completed") == 2
+    assert cache.info().expirations == 1
+
+
+def test_clear():
+    cache = ResultCache()
+    cache.put("a", 1)
+    cache.clear()
+    assert cache.get("a") is MISSING
+    assert cache.info().entries == 0
+
+
+def test_items_skips_expired_entries():
+    timer = FakeTimer()
+    cache = ResultCache(timer=timer)
+    cache.put("running", 1, ttl=10)
+    cache.put("completed", 2)
+    timer.now = 11
+    assert cache.items() == [("completed", 2)]
+    assert cache.info().hits == 0
+
+
+def test_discard():
+    cache = ResultCache(max_bytes=10, sizeof=len)
+    cache.put("a", "xx")
+    cache.discard("a")
+    cache.discard("missing")
+    assert cache.get("a") is MISSING
+    assert cache.info().nbytes == 0
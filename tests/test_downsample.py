@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from incense import downsample
+
+
+@pytest.mark.parametrize("method", ["lttb", "stride", "minmax"])
+def test_downsampling_keeps_at_most_max_points(method):
+    x = np.arange(1000)
+    y = np.sin(x / 50)
+    selected = downsample.methods[method](x, y, 100)
+    assert len(selected) <= 100
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_lttb_keeps_first_and_last_point():
+    x = np.arange(1000)
+    selected = downsample.lttb(x, np.cos(x / 10), 50)
+    assert len(selected) == 50
+    assert selected[0] == 0
+    assert selected[-1] == 999
+
+
+def test_minmax_keeps_extrema():
+    y = np.zeros(1000)
+    y[123] = 5
+    y[456] = -5
+    selected = downsample.minmax(np.arange(1000), y, 20)
+    assert 123 in selected
+    assert 456 in selected
+
+
+def test_stride():
+    assert downsample.stride(np.arange(10), np.arange(10), 5).tolist() == [0, 2, 4, 6, 8]
+
+
+@pytest.mark.parametrize("method", ["lttb", "stride", "minmax"])
+@pytest.mark.parametrize("max_points", [0, -1])
+def test_downsampling_with_invalid_max_points(method, max_points):
+    x = np.arange(10)
+    with pytest.raises(ValueError):
+        downsample.methods[method](x, x, max_points)
+
+
+@pytest.mark.parametrize("method", ["lttb", "stride", "minmax"])
+def test_downsampling_to_a_single_point(method):
+    x = np.arange(10)
+    assert len(downsample.methods[method](x, np.sin(x), 1)) == 1
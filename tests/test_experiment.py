@@ -88,7 +88,7 @@ def test_delete_prompt(loader, monkeypatch):
     with monkeypatch.context() as m:
         m.setattr("builtins.input", lambda x: "N")
         exp.delete()
-    loader.find_by_id.cache_clear()
+    loader.cache_clear()
     exp = loader.find_by_id(1)
     assert exp.id == 1
 
@@ -175,3 +175,26 @@ def experiment_with_pandas_in_info(info_mongo_observer, info_db_loader) -> sacre
 def test_info_allows_restoring_pandas_dataframes(experiment_with_pandas_in_info, info_db_loader):
     exp_unpickled = info_db_loader.find_by_id(experiment_with_pandas_in_info._id)
     assert_frame_equal(exp_unpickled.info["dataframe"], experiment_with_pandas_in_info.info["dataframe"])
+
+
+def test_info_is_decoded_once(experiment_with_numpy_in_info, info_db_loader):
+    exp = info_db_loader.find_by_id(experiment_with_numpy_in_info._id)
+    assert exp._info is None
+    assert exp.info is exp.info
+
+
+def test_get_metric__step_range(loader):
+    exp = loader.find_by_id(2)
+    metric = exp.get_metric("training_loss", start_step=1)
+    assert metric.index.name == "step"
+    assert metric.index.min() >= 1
+    assert metric.tolist() == exp.metrics["training_loss"].loc[1:].tolist()
+
+
+def test_get_metric__downsampled(loader):
+    exp = loader.find_by_id(2)
+    assert len(exp.get_metric("training_loss", max_points=2, method="stride")) <= 2
+    with raises(ValueError):
+        exp.get_metric("training_loss", max_points=2, method="median")
+    with raises(ValueError):
+        exp.get_metric("training_loss", max_points=0, method="stride")
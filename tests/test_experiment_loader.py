@@ -1,11 +1,17 @@
+from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 from pytest import raises
 from sacred import Experiment as SacredExperiment
 
+from .conftest import MONGO_URI, TEST_DB_NAME
+
+from incense import ExperimentLoader
 from incense.experiment import Experiment, FileSystemExperiment
 from incense.experiment_loader import FileSystemExperimentLoader
+from incense.watch import ExperimentUpdate
 
 
 def test_find_by_id(loader):
@@ -21,11 +27,65 @@ def test_find_by_ids(loader):
     assert len(exps) == 2
 
 
+def test_find_by_ids__keeps_order_of_ids(loader):
+    exps = loader.find_by_ids([3, 1, 2])
+    assert [exp.id for exp in exps] == [3, 1, 2]
+
+
+def test_find_by_ids__fills_find_by_id_cache(loader):
+    exps = loader.find_by_ids([1, 2])
+    assert loader.find_by_id(1) is exps[0]
+    assert loader.find_by_id(2) is exps[1]
+
+
+def test_find_by_ids__reports_all_missing_ids(loader):
+    with raises(ValueError, match=r'Experiments with ids \[4, 5\] do not exist in database "incense_test".'):
+        loader.find_by_ids([1, 4, 5])
+
+
+def test_cache_info(loader):
+    loader.find_by_id(1)
+    loader.find_by_id(1)
+    info = loader.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+def test_caches_are_per_loader():
+    loader1 = ExperimentLoader(mongo_uri=MONGO_URI, db_name=TEST_DB_NAME)
+    loader2 = ExperimentLoader(mongo_uri=MONGO_URI, db_name=TEST_DB_NAME, max_cache_entries=1)
+    loader1.find_by_ids([1, 2])
+    loader2.find_by_ids([1, 2])
+    assert loader1.cache_info().entries == 2
+    assert loader2.cache_info().entries == 1
+    assert loader2.cache_info().evictions == 1
+
+
 def test_find_by_name(loader):
     exps = loader.find_by_name("example")
     assert len(exps) == 3
 
 
+def test_find_by_name__exact_and_prefix(loader):
+    assert len(loader.find_by_name("example", match="exact")) == 3
+    assert len(loader.find_by_name("exampl", match="exact")) == 0
+    assert len(loader.find_by_name("exam", match="prefix")) == 3
+    assert len(loader.find_by_name("xample", match="prefix")) == 0
+    assert len(loader.find_by_name(".*", match="prefix")) == 0
+
+
+def test_find_by_name__text(loader):
+    loader.ensure_indexes()
+    assert len(loader.find_by_name("example", match="text")) == 3
+
+
+def test_find_by_key__invalid_match(loader):
+    with raises(ValueError):
+        loader.find_by_key("config.optimizer", "adam", match="fuzzy")
+    with raises(ValueError, match="only supported for"):
+        loader.find_by_config_key("optimizer", "adam", match="text")
+
+
 def test_find_by_key(loader):
     exps = loader.find_by_key("config.optimizer", "adam")
     assert len(exps) == 1
@@ -36,6 +96,8 @@ def test_find_by_str_config_key(loader):
     exps = loader.find_by_config_key("optimizer", "adam")
     assert len(exps) == 1
     assert exps[0].config["optimizer"] == "adam"
+    assert len(loader.find_by_config_key("optimizer", "ad", match="prefix")) == 1
+    assert len(loader.find_by_config_key("optimizer", "ad", match="exact")) == 0
 
 
 def test_find_by_number_config_key(loader):
@@ -104,6 +166,134 @@ def test_find(loader):
     assert exps[0].id == 2
 
 
+def test_find__with_fields(loader):
+    exps = loader.find({"config.optimizer": "adam"}, fields=["config"])
+    assert "captured_out" not in exps[0]._data
+    assert exps[0].config["optimizer"] == "adam"
+
+
+def test_find_all__with_exclude_fetches_excluded_field_lazily(loader):
+    exps = loader.find_all(exclude=["captured_out"])
+    assert "captured_out" not in exps[0]._data
+    assert isinstance(exps[0].captured_out, str)
+
+
+def test_find__with_fields_does_not_fetch_private_names(loader, monkeypatch):
+    exp = loader.find({"config.optimizer": "adam"}, fields=["config"])[0]
+    monkeypatch.setattr(exp, "_fetch_fields", None)
+    assert not hasattr(exp, "_repr_html_")
+    assert exp._id == exp.id
+
+
+def test_find__with_fields_projects_left_out_fields_in_one_query(loader, monkeypatch):
+    exps = loader.find_all(fields=["config"])
+    for exp in exps:
+        monkeypatch.setattr(exp, "_fetch_fields", None)
+    projected = exps.project(on=["captured_out", "config.epochs"])
+    assert projected["captured_out"].notnull().all()
+    assert all(isinstance(exp.captured_out, str) for exp in exps)
+
+
+def test_find__with_dotted_fields(loader):
+    with raises(ValueError, match="Only top-level fields"):
+        loader.find({}, fields=["config.optimizer"])
+
+
+def test_find__with_fields_and_exclude(loader):
+    with raises(ValueError, match="Only one of fields and exclude can be given."):
+        loader.find({}, fields=["config"], exclude=["captured_out"])
+
+
+def test_persistent_cache(tmpdir):
+    loader = ExperimentLoader(mongo_uri=MONGO_URI, db_name=TEST_DB_NAME, cache_dir=tmpdir)
+    exp = loader.find_by_id(1)
+    assert "training_loss" in exp.metrics
+
+    reloaded = ExperimentLoader(mongo_uri=MONGO_URI, db_name=TEST_DB_NAME, cache_dir=tmpdir)
+    assert reloaded._persistent_cache.get_runs(reloaded._cache_key, [1])
+    assert reloaded.find_by_id(1).to_dict() == exp.to_dict()
+    assert reloaded.find_by_id(1).metrics["training_loss"].equals(exp.metrics["training_loss"])
+
+    reloaded.cache_clear(persistent=True)
+    assert reloaded._persistent_cache.get_runs(reloaded._cache_key, [1]) == {}
+
+
+def test_refresh(delete_db_loader, delete_mongo_observer, add_exp_to_db):
+    first_id = add_exp_to_db(delete_mongo_observer, config_value=1)
+    all_exps = delete_db_loader.find_all()
+    exps = delete_db_loader.find_by_config_key("value", 1)
+    second_id = add_exp_to_db(delete_mongo_observer, config_value=1)
+    delete_db_loader._runs.update_one({"_id": first_id}, {"$set": {"status": "FAILED", "stop_time": datetime.utcnow()}})
+
+    updated = delete_db_loader.refresh()
+    assert {exp.id for exp in updated} == {first_id, second_id}
+    assert [exp.id for exp in exps] == [first_id, second_id]
+    assert exps[0].status == "FAILED"
+    assert delete_db_loader.find_all() is all_exps
+    assert [exp.id for exp in all_exps] == [first_id, second_id]
+
+    exps.delete(confirmed=True)
+    assert all_exps.data == []
+
+
+def test_refresh__ignores_runs_no_cached_result_needs(delete_db_loader, delete_mongo_observer, add_exp_to_db):
+    first_id = add_exp_to_db(delete_mongo_observer, config_value=1)
+    exp = delete_db_loader.find_by_id(first_id)
+    second_id = add_exp_to_db(delete_mongo_observer, config_value=2)
+    fetched = []
+    find = delete_db_loader._runs.find
+
+    def find_recording_full_documents(query, projection=None, **kwargs):
+        cursor = list(find(query, projection, **kwargs))
+        if projection is None:
+            fetched.extend(run["_id"] for run in cursor)
+        return cursor
+
+    delete_db_loader._runs = SimpleNamespace(find=find_recording_full_documents)
+    updated = delete_db_loader.refresh()
+    assert second_id not in fetched
+    assert second_id not in {updated_exp.id for updated_exp in updated}
+    delete_db_loader._runs = delete_db_loader._database.runs
+    assert delete_db_loader.find_by_id(first_id) is exp
+    exp.delete(confirmed=True)
+
+
+def test_refresh__keeps_projections(delete_db_loader, delete_mongo_observer, add_exp_to_db):
+    first_id = add_exp_to_db(delete_mongo_observer, config_value=1)
+    exps = delete_db_loader.find_by_config_key("value", 1, fields=["config", "status"])
+    second_id = add_exp_to_db(delete_mongo_observer, config_value=1)
+    delete_db_loader._runs.update_one({"_id": first_id}, {"$set": {"status": "FAILED", "stop_time": datetime.utcnow()}})
+
+    delete_db_loader.refresh()
+    assert [exp.id for exp in exps] == [first_id, second_id]
+    assert exps[0].status == "FAILED"
+    for exp in exps:
+        assert "captured_out" not in exp._document
+        assert exp._projection == exps._projection
+    exps.delete(confirmed=True)
+
+
+def test_watch__polling(delete_db_loader, delete_mongo_observer, add_exp_to_db):
+    exp_id = add_exp_to_db(delete_mongo_observer, config_value=1)
+    exp = delete_db_loader.find_by_id(exp_id)
+    assert exp.metrics["test_metric"].tolist() == [1]
+    watcher = delete_db_loader.watch({"config.value": 1}, change_streams=False)
+    assert watcher.poll() == []
+
+    delete_db_loader._runs.update_one({"_id": exp_id}, {"$set": {"status": "RUNNING", "heartbeat": datetime.utcnow()}})
+    delete_db_loader._database.metrics.update_one(
+        {"run_id": exp_id, "name": "test_metric"}, {"$push": {"steps": 1, "values": 2}}
+    )
+    updates = watcher.poll()
+    assert updates[0] == ExperimentUpdate(exp)
+    assert exp.status == "RUNNING"
+    assert (updates[1].name, updates[1].points.tolist()) == ("test_metric", [2])
+    assert exp.metrics["test_metric"].tolist() == [1, 2]
+    assert watcher.poll() == []
+
+    exp.delete(confirmed=True)
+
+
 def test_error_message_for_missing_id(loader):
     with raises(ValueError, match='Experiment with id 4 does not exist in database "incense_test".'):
         exp = loader.find_by_id(4)
@@ -0,0 +1,59 @@
+import pickle
+
+import pandas as pd
+
+from pytest import raises
+
+from incense.frozen import FrozenDict, FrozenList, freeze, thaw
+
+
+def test_freeze_wraps_nested_values_on_access():
+    data = {"config": {"layers": [{"units": 3}]}}
+    frozen = freeze(data)
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen.config.layers, FrozenList)
+    assert frozen.config.layers[0].units == 3
+    assert frozen["config"]["layers"] == [{"units": 3}]
+
+
+def test_freeze_does_not_copy():
+    data = {"config": {"epochs": 1}}
+    frozen = freeze(data)
+    data["config"]["epochs"] = 2
+    assert frozen.config.epochs == 2
+
+
+def test_immutability():
+    frozen = freeze({"meta": {"command": "run"}, "tags": ["a"]})
+    with raises(TypeError):
+        frozen.meta["command"] = "mutate"
+    with raises(AttributeError):
+        frozen.meta.command = "mutate"
+    with raises(TypeError):
+        frozen.tags[0] = "b"
+
+
+def test_missing_attribute():
+    with raises(AttributeError):
+        freeze({"a": 1}).b
+
+
+def test_thaw_returns_independent_copy():
+    data = {"config": {"epochs": 1}}
+    thawed = thaw(freeze(data))
+    thawed["config"]["epochs"] = 2
+    assert thawed == {"config": {"epochs": 2}}
+    assert data == {"config": {"epochs": 1}}
+
+
+def test_pickle():
+    frozen = freeze({"a": [1, 2]})
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_hash():
+    data = {"config": {"layers": [8, 4], "model": {"units": 3}}}
+    assert hash(freeze(data)) == hash(freeze({"config": {"model": {"units": 3}, "layers": [8, 4]}}))
+    assert len({freeze(data).config.layers, freeze([8, 4]), freeze([4, 8])}) == 2
+    assert len({freeze(data).config, freeze(data)["config"]}) == 1
+    assert pd.Series([freeze([1]), freeze([1]), freeze({"a": 1})]).drop_duplicates().tolist() == [[1], {"a": 1}]
@@ -0,0 +1,48 @@
+from pytest import raises
+
+from incense import indexes
+
+
+class _ExplainedCollection:
+    def __init__(self, explanation):
+        self._explanation = explanation
+
+    def find(self, query):
+        return self
+
+    def explain(self):
+        return self._explanation
+
+
+def test_explain__collscan():
+    runs = _ExplainedCollection({"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}})
+    plan = indexes.explain(runs, {"$or": [{"config.lr": 0.1}, {"status": "COMPLETED", "_id": 1}], "config.lr": 0.2})
+    assert plan.collscan
+    assert plan.suggested_indexes == ["config.lr", "status"]
+
+
+def test_explain__ignores_rejected_plans():
+    winning_plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "status_1"}}
+    runs = _ExplainedCollection(
+        {"queryPlanner": {"winningPlan": winning_plan, "rejectedPlans": [{"stage": "COLLSCAN"}]}}
+    )
+    plan = indexes.explain(runs, {"status": "COMPLETED"})
+    assert not plan.collscan
+    assert plan.indexes == ["status_1"]
+    assert plan.suggested_indexes == []
+
+
+def test_ensure_indexes(loader):
+    loader.ensure_indexes()
+    assert loader.ensure_indexes() == []
+    assert "experiment.name_1" in loader._runs.index_information()
+    assert not loader.explain({"status": "COMPLETED"}).collscan
+
+
+def test_explain_query_set(loader):
+    plan = loader.explain(loader.find({"config.optimizer": "adam"}))
+    assert plan.query == {"config.optimizer": "adam"}
+    assert plan.collscan
+    assert plan.suggested_indexes == ["config.optimizer"]
+    with raises(ValueError):
+        loader.explain(loader.find_by_ids([1, 2]))
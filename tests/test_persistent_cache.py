@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from incense.persistent_cache import PersistentCache
+
+
+def test_put_and_get_run(tmpdir):
+    cache = PersistentCache(tmpdir)
+    run = {"_id": 1, "status": "COMPLETED", "start_time": datetime(2020, 1, 1), "config": {"epochs": 3}}
+    cache.put_run("db", run)
+    assert cache.get_runs("db", [1, 2]) == {1: run}
+    assert cache.get_runs("other_db", [1]) == {}
+
+
+def test_unfinished_runs_are_not_cached(tmpdir):
+    cache = PersistentCache(tmpdir)
+    cache.put_run("db", {"_id": 1, "status": "RUNNING"})
+    assert cache.get_runs("db", [1]) == {}
+
+
+def test_put_and_get_metrics(tmpdir):
+    cache = PersistentCache(tmpdir)
+    metrics = [{"run_id": 1, "name": "loss", "steps": [0, 1], "values": [1.0, 0.5]}]
+    cache.put_metrics("db", 1, metrics)
+    assert cache.get_metrics("db", [1]) == {1: metrics}
+
+
+def test_eviction_of_least_recently_used_runs(tmpdir):
+    cache = PersistentCache(tmpdir, max_size=1000)
+    for run_id in range(10):
+        cache.put_run("db", {"_id": run_id, "status": "COMPLETED", "captured_out": "x" * 200})
+    assert cache.size <= 1000
+    assert set(cache.get_runs("db", range(10))) == {7, 8, 9}
+
+
+def test_clear(tmpdir):
+    cache = PersistentCache(tmpdir)
+    cache.put_run("db", {"_id": 1, "status": "COMPLETED"})
+    cache.put_run("other_db", {"_id": 1, "status": "COMPLETED"})
+    cache.clear("db")
+    assert cache.get_runs("db", [1]) == {}
+    assert set(cache.get_runs("other_db", [1])) == {1}
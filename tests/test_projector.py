@@ -1,8 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
+import pytest
 from pandas.testing import assert_frame_equal
 from pytest import raises
 
+from incense import reducers
+from incense.experiment import Experiment
+from incense.frozen import FrozenDict
+from incense.projection import compile_path, make_projection_pipeline
+from incense.query_set import QuerySet, ReducerError
+
 
 def test_projection_with_renaming(loader):
     exps = loader.find_by_ids([1, 2, 3])
@@ -60,3 +69,147 @@ def test_projection_with_heterogenous_formats__should_raise(
     exps = heterogenous_db_loader.find_by_ids([id1, id2, id3])
     with raises(KeyError):
         projected = exps.project(on=["config.value.param1"])
+
+
+def test_projection_with_database_reducers(loader, delete_db_loader, delete_mongo_observer, add_exp_to_db):
+    exps = loader.find_by_ids([1, 2, 3])
+    projected = exps.project(
+        on=[{"metrics.training_loss": reducers.mean}, {"metrics.training_accuracy": reducers.count}]
+    )
+    expected = exps.project(on=[{"metrics.training_loss": np.mean}, {"metrics.training_accuracy": len}])
+    assert_frame_equal(projected["training_loss_mean"].to_frame(), expected["training_loss_mean"].to_frame())
+    assert projected["training_accuracy_count"].tolist() == expected["training_accuracy_len"].tolist()
+
+    # NaN values, e.g. of a diverged loss, are skipped like pandas does.
+    exp_id = add_exp_to_db(delete_mongo_observer, config_value=1)
+    delete_db_loader._database.metrics.insert_one(
+        {"run_id": exp_id, "name": "loss", "steps": [0, 1, 2, 3], "values": [0.5, float("nan"), 0.1, 0.3]}
+    )
+    on = [{"metrics.loss": reducer} for reducer in (reducers.mean, reducers.min_, reducers.argmin, reducers.max_)]
+    projected = delete_db_loader.find_by_ids([exp_id]).project(on=on)
+    assert projected.loc[exp_id].tolist() == pytest.approx([0.3, 0.1, 2, 0.5])
+    metric = delete_db_loader.find_by_id(exp_id).metrics["loss"]
+    assert [metric.mean(), metric.min(), metric.idxmin(), metric.max()] == pytest.approx([0.3, 0.1, 2, 0.5])
+    delete_db_loader.find_by_id(exp_id).delete(confirmed=True)
+
+
+def test_projection_with_database_reducers__should_raise_on_missing_metric(loader):
+    exps = loader.find_by_ids([1, 2, 3])
+    with raises(KeyError):
+        exps.project(on=[{"metrics.missing": reducers.max_}])
+    projected = exps.project(on=[{"metrics.missing": reducers.max_}], on_missing="ignore")
+    assert projected["missing_max"].isnull().all()
+
+
+def test_database_reducers_match_client_side_evaluation(loader):
+    metric = loader.find_by_id(2).metrics["training_loss"]
+    assert reducers.argmin(metric) == metric.idxmin()
+    assert reducers.last(metric) == metric.iloc[-1]
+
+
+def _make_in_memory_experiments():
+    runs = [
+        {"_id": 1, "config": {"lr": 0.1, "layers": [8, 4], "model": {"name": "a"}}},
+        {"_id": 2, "config": {"lr": 0.2, "layers": [16], "model": {}}},
+    ]
+    experiments = [Experiment.from_db_object(None, None, run, loader=None, unpickle=False) for run in runs]
+    for exp in experiments:
+        exp._metrics["loss"] = pd.Series([0.5, 0.25])
+        exp._all_metrics_loaded = True
+    return QuerySet(experiments)
+
+
+def test_compiled_paths_match_resolving_every_step():
+    exps = _make_in_memory_experiments()
+    for path in [("config",), ("config", "lr"), ("config", "layers"), ("config", "model", "name"), ("metrics", "loss")]:
+        accessor = compile_path(path, fallback=lambda exp: exps._resolve(exp, path, "ignore"))
+        for exp in exps:
+            expected = exps._resolve(exp, path, "ignore")
+            if isinstance(expected, pd.Series):
+                assert accessor(exp).equals(expected)
+            else:
+                assert accessor(exp) == expected
+    assert isinstance(compile_path(("config",), fallback=None)(exps[0]), FrozenDict)
+
+
+def test_compiled_paths_fall_back_for_attributes():
+    def fallback(exp):
+        return None
+
+    for path in [("id",), ("info",), ("metrics",), ("config", "items"), ("metrics", "keys"), ("metrics", "loss", "x")]:
+        assert compile_path(path, fallback) is fallback
+
+
+def test_projection_of_in_memory_experiments():
+    exps = _make_in_memory_experiments()
+    projected = exps.project(
+        on=[("config", "lr"), "config.model.name", "config.layers", {"metrics.loss": max}], on_missing="ignore"
+    )
+    assert projected.columns.tolist() == ["lr", "name", "layers", "loss_max"]
+    assert projected.index.tolist() == [1, 2]
+    assert projected["lr"].tolist() == [0.1, 0.2]
+    assert projected["name"].iloc[0] == "a"
+    assert projected["name"].isnull().iloc[1]
+    assert projected["layers"].tolist() == [[8, 4], [16]]
+    assert projected["loss_max"].tolist() == [0.5, 0.5]
+    with raises(KeyError):
+        exps.project(on=["config.model.name"])
+
+
+def test_loader_project_matches_query_set_project(loader):
+    on = ["config.epochs", "status", "start_time", {"metrics.training_loss": reducers.mean}]
+    projected = loader.project({"config.optimizer": "sgd"}, on=on)
+    assert_frame_equal(projected, loader.find({"config.optimizer": "sgd"}).project(on=on))
+
+
+def test_loader_project__on_missing(loader):
+    with raises(KeyError):
+        loader.project({}, on=[{"metrics.missing": reducers.max_}])
+    projected = loader.project({}, on=["config.missing", {"metrics.missing": reducers.max_}], on_missing="ignore")
+    assert projected.isnull().all().all()
+
+
+def test_loader_project__with_custom_reducer(loader):
+    on = ["config.epochs", {"metrics.training_loss": np.mean}]
+    assert_frame_equal(loader.project({}, on=on), loader.find({}).project(on=on))
+
+
+def test_make_projection_pipeline():
+    pipeline = make_projection_pipeline(
+        {"status": "COMPLETED"},
+        {("config", "epochs"): ("config", "epochs"), ("metrics", "loss"): reducers.mean},
+    )
+    assert pipeline[0] == {"$match": {"status": "COMPLETED"}}
+    assert pipeline[1] == {"$project": {"_id": 1, "values": {"0": "$config.epochs"}}}
+    assert pipeline[2]["$lookup"]["from"] == "metrics"
+    assert make_projection_pipeline({}, {("metrics", "loss"): np.mean}) is None
+    assert make_projection_pipeline({}, {("info",): ("info",)}) is None
+
+
+def test_projection_with_parallel_reducers():
+    exps = _make_in_memory_experiments()
+    on = ["config.lr", {"metrics.loss": np.mean}, {"config.layers": len}]
+    expected = exps.project(on=on)
+    assert_frame_equal(exps.project(on=on, n_jobs=2), expected)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert_frame_equal(exps.project(on=on, executor=executor), expected)
+
+
+def test_projection_with_parallel_reducers__on_missing():
+    exps = _make_in_memory_experiments()
+    projected = exps.project(on=[{"metrics.missing": np.mean}], on_missing="ignore", n_jobs=2)
+    assert projected["missing_mean"].isnull().all()
+    with raises(KeyError):
+        exps.project(on=[{"metrics.missing": np.mean}], n_jobs=2)
+
+
+def test_projection_with_failing_reducer():
+    exps = _make_in_memory_experiments()
+    on = [{"config.layers": lambda layers: layers[1]}]
+    with raises(IndexError):
+        exps.project(on=on)
+    with raises(ReducerError, match="config.layers of experiment 2") as exc_info:
+        exps.project(on=on, n_jobs=2)
+    assert exc_info.value.exp_id == 2
+    assert exc_info.value.path == ("config", "layers")
+    assert isinstance(exc_info.value.error, IndexError)
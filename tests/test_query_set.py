@@ -1,5 +1,10 @@
+from types import SimpleNamespace
+
+import pandas as pd
 from pytest import raises
 
+from incense.query_set import QuerySet
+
 
 def test_repr(loader):
     exps = loader.find_by_ids([1, 2])
@@ -35,3 +40,92 @@ def test_delete_prompt(loader, monkeypatch, capsys):
     exps = loader.find_by_ids([1, 2])
     assert exps[0].id == 1
     assert exps[1].id == 2
+
+
+def test_lazy_find_all(loader):
+    exps = loader.find_all(lazy=True, batch_size=2)
+    assert repr(exps) == "LazyQuerySet(query={})"
+    assert len(exps) == 3
+    assert [exp.id for exp in exps] == [1, 2, 3]
+    assert exps[-1].id == 3
+    with raises(IndexError):
+        exps[3]
+
+
+def test_lazy_find__slicing(loader):
+    exps = loader.find({"config.optimizer": "sgd"}, lazy=True)
+    assert len(exps[1:]) == 1
+    assert exps[1:][0].id == 2
+    assert [exp.id for exp in exps[::2]] == [1]
+
+
+def test_lazy_find__project(loader):
+    exps = loader.find({}, lazy=True)
+    projected = exps.project(on=["config.epochs"])
+    assert projected.index.tolist() == [1, 2, 3]
+    assert projected["epochs"].tolist() == [1, 3, 1]
+
+
+def test_load_metrics(loader):
+    exps = loader.find_by_ids([1, 2, 3])
+    exps.load_metrics()
+    for exp in exps:
+        assert exp._all_metrics_loaded
+        assert "training_loss" in exp.metrics
+
+
+def test_load_metrics__by_name(loader):
+    loader.cache_clear()
+    exps = loader.find_by_ids([1, 2, 3])
+    exps.load_metrics(names=["training_loss"])
+    for exp in exps:
+        assert list(exp._metrics) == ["training_loss"]
+        assert not exp._all_metrics_loaded
+    assert "test_loss" in exps[0].metrics
+
+
+def test_load_metrics__lazy(loader):
+    exps = loader.find({"_id": {"$in": [1, 2]}}, lazy=True)
+    exps.load_metrics()
+    assert all(exp._all_metrics_loaded for exp in exps)
+
+
+def test_load_fields__lazy(loader):
+    exps = loader.find({"_id": {"$in": [1, 2]}}, fields=["config"], lazy=True)
+    exps.load_fields(["captured_out"])
+    assert all("captured_out" in exp._fetched_fields for exp in exps)
+
+
+def test_metrics_frame__aligned_by_step(loader):
+    exps = loader.find_by_ids([1, 2])
+    metrics = exps.metrics_frame(["training_loss"])
+    assert metrics.index.name == "step"
+    assert metrics.columns.names == ["name", "exp_id"]
+    assert metrics[("training_loss", 2)].dropna().tolist() == exps[1].metrics["training_loss"].tolist()
+
+
+def test_metrics_frame__aligned_by_run(loader):
+    exps = loader.find_by_ids([1, 2])
+    metrics = exps.metrics_frame(["training_loss", "test_loss"], align="run")
+    assert metrics.index.names == ["exp_id", "step"]
+    assert set(metrics.columns) == {"training_loss", "test_loss"}
+    assert metrics.loc[1, "training_loss"].tolist() == exps[0].metrics["training_loss"].tolist()
+
+
+def test_metrics_frame__with_duplicate_steps():
+    loss = pd.Series([0.5, 0.4, 0.3], index=pd.Index([0, 1, 1], name="step"))
+    exps = QuerySet([SimpleNamespace(id=1, metrics={"loss": loss})])
+    metrics = exps.metrics_frame(align="run")
+    assert metrics.loc[1, "loss"].tolist() == [0.5, 0.3]
+
+
+def test_metrics_frame__with_string_ids():
+    loss = pd.Series([0.5, 0.4], index=pd.Index([0, 1], name="step"))
+    exps = QuerySet([SimpleNamespace(id="a", metrics={"loss": loss}), SimpleNamespace(id="b", metrics={"loss": loss})])
+    metrics = exps.metrics_frame()
+    assert metrics[("loss", "b")].tolist() == [0.5, 0.4]
+
+
+def test_metrics_frame__with_unknown_align(loader):
+    with raises(ValueError):
+        loader.find_by_ids([1, 2]).metrics_frame(align="time")
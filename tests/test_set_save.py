@@ -1,5 +1,9 @@
 import os
 
+from pytest import raises
+
+from incense.query_set import ArtifactSetError
+
 
 def test_single_save(loader, tmpdir):
     exp_ids = [1, 2, 3]
@@ -19,3 +23,55 @@ def test_glob_save(loader, tmpdir):
         assert os.path.isfile(filepath)
         filepath = str(tmpdir / f"{exp_id}_confusion_matrix.pdf")
         assert os.path.isfile(filepath)
+
+
+def test_save__reports_progress(loader, tmpdir):
+    exps = loader.find_by_ids([1, 2, 3])
+    progress = []
+    exps.artifacts["confusion_matrix"].save(to_dir=tmpdir, n_threads=2, progress=lambda *args: progress.append(args))
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_save__raises_aggregated_errors(loader, tmpdir):
+    exps = loader.find_by_ids([1, 2, 3])
+    artifacts = exps.artifacts["confusion_matrix"]
+
+    def fail(to_dir):
+        raise OSError("No space left on device")
+
+    artifacts[0].save = fail
+    with raises(ArtifactSetError, match=r"1 artifacts failed \(confusion_matrix\)") as exc_info:
+        artifacts.save(to_dir=tmpdir)
+    assert exc_info.value.errors[0][0] is artifacts[0]
+    for exp_id in [2, 3]:
+        assert os.path.isfile(str(tmpdir / f"{exp_id}_confusion_matrix.png"))
+
+
+def test_load_artifacts(loader):
+    exps = loader.find_by_ids([1, 2, 3])
+    exps.load_artifacts()
+    for exp in exps:
+        assert exp._artifacts is not None
+        assert exp.artifacts["confusion_matrix"].content_type == "image/png"
+
+
+def test_load_artifacts__lazy(loader):
+    exps = loader.find({"_id": {"$in": [1, 2, 3]}}, lazy=True)
+    artifacts = exps.artifacts["confusion_matrix"]
+    assert len(artifacts) == 3
+    assert all(exp._artifacts is not None for exp in exps)
+
+
+def test_to_frame(loader):
+    exps = loader.find_by_ids([1, 2, 3])
+    df = exps.artifacts["predictions"].to_frame(n_threads=2)
+    assert df.index.get_level_values("exp_id").unique().tolist() == [1, 2, 3]
+    assert df.loc[3].equals(exps[2].artifacts["predictions"].render())
+
+
+def test_to_frame__of_other_artifacts(loader):
+    artifacts = loader.find_by_ids([1, 2, 3]).artifacts["confusion_matrix"]
+    with raises(TypeError, match="Only CSV artifacts"):
+        artifacts.to_frame()
+    with raises(TypeError, match="Only Parquet and Arrow artifacts"):
+        artifacts.to_table()